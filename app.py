@@ -3,105 +3,175 @@ Versor - Local Web UI for image to SVG conversion
 Supports multiple vectorization methods: Potrace, Centerline, vtracer
 """
 
+import hashlib
 import os
-import base64
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from flask import Flask, render_template, request, jsonify, send_from_directory
 
-from config import UPLOAD_FOLDER, OUTPUT_FOLDER
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from config import UPLOAD_FOLDER, OUTPUT_FOLDER, MAX_UPLOAD_MB
 from presets import POTRACE_PRESETS, CENTERLINE_PRESETS, VTRACER_PRESETS
 from converters import (
     convert_with_potrace,
     convert_with_centerline,
     convert_with_vtracer,
     check_dependencies,
-    get_available_methods
+    get_available_methods,
+    refresh_dependencies
 )
 
 app = Flask(__name__)
 
+# Reject oversized requests at the socket level before anything is
+# written to disk (tunable via VERSOR_MAX_UPLOAD_MB; the cap lives in
+# config so the tmpfs sizing check uses the same number)
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_MB * 1024 * 1024
+
+# Mime lookup tables, built once at import
+_IMG_MIME = {'.png': 'image/png', '.jpg': 'image/jpeg',
+             '.jpeg': 'image/jpeg', '.gif': 'image/gif', '.bmp': 'image/bmp'}
+_OUT_MIME = {'.svg': 'image/svg+xml', '.pdf': 'application/pdf',
+             '.eps': 'application/postscript', '.dxf': 'application/dxf'}
+
+
+def json_response(payload, status=200):
+    """Serialize a JSON response with orjson when available (3-5x faster)."""
+    if orjson is not None:
+        return app.response_class(orjson.dumps(payload), status=status,
+                                  mimetype='application/json')
+    return jsonify(payload), status
+
+
+# Original-image previews are served from disk via /preview_original
+# instead of being base64-embedded in the /convert JSON response.
+# Tokens map to saved uploads and expire after PREVIEW_TTL seconds.
+PREVIEW_TTL = 15 * 60
+_preview_files = {}  # token -> (filename, expiry time)
+_preview_lock = threading.Lock()
+
+
+def _register_preview(filename):
+    """Register an uploaded file for preview and return its access token."""
+    token = uuid.uuid4().hex
+    with _preview_lock:
+        _preview_files[token] = (filename, time.time() + PREVIEW_TTL)
+    return token
+
+
+def _reap_expired_previews():
+    """Background loop removing preview files whose TTL has passed."""
+    while True:
+        time.sleep(60)
+        now = time.time()
+        with _preview_lock:
+            expired = [t for t, (_, exp) in _preview_files.items() if exp < now]
+            filenames = [_preview_files.pop(t)[0] for t in expired]
+        for filename in filenames:
+            (Path(UPLOAD_FOLDER) / filename).unlink(missing_ok=True)
+
+
+threading.Thread(target=_reap_expired_previews, daemon=True).start()
+
+
+# Preset values are constants, so the preset-derived part of each settings
+# dict is materialized once at import; requests only overlay form-driven keys
+_POTRACE_FIELDS = ('corner_threshold', 'optimize_tolerance', 'despeckle', 'threshold')
+_CENTERLINE_FIELDS = ('despeckle_level', 'corner_threshold', 'line_threshold', 'threshold')
+_VTRACER_FIELDS = ('mode', 'color_precision', 'gradient_step', 'corner_threshold',
+                   'segment_length', 'splice_threshold', 'filter_speckle')
+
+_POTRACE_BASE = {key: {f: getattr(preset, f) for f in _POTRACE_FIELDS}
+                 for key, preset in POTRACE_PRESETS.items()}
+_CENTERLINE_BASE = {key: {f: getattr(preset, f) for f in _CENTERLINE_FIELDS}
+                    for key, preset in CENTERLINE_PRESETS.items()}
+_VTRACER_BASE = {key: {f: getattr(preset, f) for f in _VTRACER_FIELDS}
+                 for key, preset in VTRACER_PRESETS.items()}
+
 
 def get_potrace_settings(preset_key, form_data):
     """Extract Potrace settings from preset or custom values."""
+    g = form_data.get  # avoid repeated method lookups in this hot path
     # Output format applies to all presets
-    output_format = form_data.get('output_format', 'svg')
+    output_format = g('output_format', 'svg')
 
     if preset_key == 'custom':
         return {
-            'corner_threshold': float(form_data.get('corner_threshold', 0)),
-            'optimize_tolerance': float(form_data.get('optimize_tolerance', 0.1)),
-            'despeckle': int(form_data.get('despeckle', 2)),
-            'threshold': int(form_data.get('threshold', 50)),
-            'invert': form_data.get('invert') == 'true',
-            'simplify': form_data.get('simplify') == 'true',
-            'simplify_tolerance': float(form_data.get('simplify_tolerance', 2.0)),
-            'straighten': form_data.get('straighten') == 'true',
-            'straighten_tolerance': float(form_data.get('straighten_tolerance', 1.0)),
+            'corner_threshold': float(g('corner_threshold', 0)),
+            'optimize_tolerance': float(g('optimize_tolerance', 0.1)),
+            'despeckle': int(g('despeckle', 2)),
+            'threshold': int(g('threshold', 50)),
+            'invert': g('invert') == 'true',
+            'simplify': g('simplify') == 'true',
+            'simplify_tolerance': float(g('simplify_tolerance', 2.0)),
+            'straighten': g('straighten') == 'true',
+            'straighten_tolerance': float(g('straighten_tolerance', 1.0)),
             'output_format': output_format
         }
-    preset = POTRACE_PRESETS.get(preset_key, POTRACE_PRESETS['cnc_precise'])
     # Post-processing options are available for all presets
-    return {
-        'corner_threshold': preset['corner_threshold'],
-        'optimize_tolerance': preset['optimize_tolerance'],
-        'despeckle': preset['despeckle'],
-        'threshold': preset['threshold'],
-        'invert': form_data.get('invert') == 'true',
-        'simplify': form_data.get('simplify') == 'true',
-        'simplify_tolerance': float(form_data.get('simplify_tolerance', 2.0)),
-        'straighten': form_data.get('straighten') == 'true',
-        'straighten_tolerance': float(form_data.get('straighten_tolerance', 1.0)),
-        'output_format': output_format
-    }
+    settings = dict(_POTRACE_BASE.get(preset_key, _POTRACE_BASE['cnc_precise']))
+    settings.update(
+        invert=g('invert') == 'true',
+        simplify=g('simplify') == 'true',
+        simplify_tolerance=float(g('simplify_tolerance', 2.0)),
+        straighten=g('straighten') == 'true',
+        straighten_tolerance=float(g('straighten_tolerance', 1.0)),
+        output_format=output_format
+    )
+    return settings
 
 
 def get_centerline_settings(preset_key, form_data):
     """Extract centerline settings from preset or custom values."""
+    g = form_data.get  # avoid repeated method lookups in this hot path
     # Output format applies to all presets
-    output_format = form_data.get('output_format', 'svg')
+    output_format = g('output_format', 'svg')
 
     if preset_key == 'custom':
         return {
-            'despeckle_level': int(form_data.get('despeckle_level', 2)),
-            'corner_threshold': int(form_data.get('cl_corner_threshold', 100)),
-            'line_threshold': float(form_data.get('line_threshold', 1.0)),
-            'threshold': int(form_data.get('threshold', 50)),
-            'invert': form_data.get('invert') == 'true',
+            'despeckle_level': int(g('despeckle_level', 2)),
+            'corner_threshold': int(g('cl_corner_threshold', 100)),
+            'line_threshold': float(g('line_threshold', 1.0)),
+            'threshold': int(g('threshold', 50)),
+            'invert': g('invert') == 'true',
             'output_format': output_format
         }
-    preset = CENTERLINE_PRESETS.get(preset_key, CENTERLINE_PRESETS['line_art'])
-    return {
-        'despeckle_level': preset['despeckle_level'],
-        'corner_threshold': preset['corner_threshold'],
-        'line_threshold': preset['line_threshold'],
-        'threshold': preset['threshold'],
-        'invert': form_data.get('invert') == 'true',
-        'output_format': output_format
-    }
+    settings = dict(_CENTERLINE_BASE.get(preset_key, _CENTERLINE_BASE['line_art']))
+    settings.update(
+        invert=g('invert') == 'true',
+        output_format=output_format
+    )
+    return settings
 
 
 def get_vtracer_settings(preset_key, form_data):
     """Extract vtracer settings from preset or custom values."""
+    g = form_data.get  # avoid repeated method lookups in this hot path
     if preset_key == 'custom':
         return {
-            'mode': form_data.get('mode', 'spline'),
-            'color_precision': int(form_data.get('color_precision', 6)),
-            'gradient_step': int(form_data.get('gradient_step', 8)),
-            'corner_threshold': int(form_data.get('vt_corner_threshold', 60)),
-            'segment_length': int(form_data.get('segment_length', 4)),
-            'splice_threshold': int(form_data.get('splice_threshold', 45)),
-            'filter_speckle': int(form_data.get('filter_speckle', 4))
+            'mode': g('mode', 'spline'),
+            'color_precision': int(g('color_precision', 6)),
+            'gradient_step': int(g('gradient_step', 8)),
+            'corner_threshold': int(g('vt_corner_threshold', 60)),
+            'segment_length': int(g('segment_length', 4)),
+            'splice_threshold': int(g('splice_threshold', 45)),
+            'filter_speckle': int(g('filter_speckle', 4))
         }
-    preset = VTRACER_PRESETS.get(preset_key, VTRACER_PRESETS['smooth_color'])
-    return {
-        'mode': preset['mode'],
-        'color_precision': preset['color_precision'],
-        'gradient_step': preset['gradient_step'],
-        'corner_threshold': preset['corner_threshold'],
-        'segment_length': preset['segment_length'],
-        'splice_threshold': preset['splice_threshold'],
-        'filter_speckle': preset['filter_speckle']
-    }
+    return dict(_VTRACER_BASE.get(preset_key, _VTRACER_BASE['smooth_color']))
+
+
+@app.errorhandler(413)
+def upload_too_large(e):
+    """Request body exceeded MAX_CONTENT_LENGTH."""
+    return json_response({'error': f'Upload too large (limit {MAX_UPLOAD_MB} MB)'}, 413)
 
 
 @app.route('/')
@@ -124,11 +194,14 @@ def convert():
     """Handle file conversion with method selection."""
 
     if 'files' not in request.files:
-        return jsonify({'error': 'No files provided'}), 400
+        return json_response({'error': 'No files provided'}, 400)
 
     files = request.files.getlist('files')
     method = request.form.get('method', 'potrace')
     preset_key = request.form.get('preset', 'cnc_precise')
+    # Scripted/batch callers can pass include_preview=0 to skip the
+    # original-image preview plumbing entirely (the UI always sends 1)
+    include_preview = request.form.get('include_preview', '1') == '1'
 
     # Get settings and converter based on method
     if method == 'potrace':
@@ -141,92 +214,184 @@ def convert():
         settings = get_vtracer_settings(preset_key, request.form)
         convert_func = convert_with_vtracer
     else:
-        return jsonify({'error': f'Unknown method: {method}'}), 400
+        return json_response({'error': f'Unknown method: {method}'}, 400)
 
     # Determine output format (vtracer only supports SVG)
     output_format = settings.get('output_format', 'svg')
     if method == 'vtracer':
         output_format = 'svg'
 
-    results = []
-
-    for file in files:
-        if file.filename == '':
-            continue
-
-        # Save uploaded file
-        filename = Path(file.filename).name
-        input_path = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(input_path)
-
-        # Read original image as base64 for preview (before conversion)
-        original_preview = None
-        input_size = os.path.getsize(input_path)
-        if input_size < 15000000:  # < 15MB for original preview
-            with open(input_path, 'rb') as f:
-                img_data = f.read()
-                # Detect mime type from extension
-                ext = os.path.splitext(filename)[1].lower()
-                mime_types = {'.png': 'image/png', '.jpg': 'image/jpeg',
-                              '.jpeg': 'image/jpeg', '.gif': 'image/gif', '.bmp': 'image/bmp'}
-                mime_type = mime_types.get(ext, 'image/png')
-                original_preview = f"data:{mime_type};base64,{base64.b64encode(img_data).decode('utf-8')}"
-
-        # Generate output filename with correct extension
-        base_name = os.path.splitext(filename)[0]
-        output_filename = f"{base_name}.{output_format}"
-        output_path = os.path.join(OUTPUT_FOLDER, output_filename)
-
-        # Convert
+    # Conversions are subprocess-bound, so a thread pool gives near-linear
+    # speedup on batch uploads (the GIL is released while tools run)
+    files = [f for f in files if f.filename != '']
+    if not files:
+        return json_response({'results': []})
+
+    with ThreadPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as executor:
+        results = list(executor.map(
+            lambda f: _process_one(f, method, convert_func, settings,
+                                   output_format, include_preview),
+            files
+        ))
+
+    return json_response({'results': results})
+
+
+def _save_upload(file, input_path, chunk=64 * 1024):
+    """
+    Stream an upload to disk in one pass.
+
+    Returns (size, sha1 hex digest) - both computed while writing, so no
+    follow-up stat or re-read is needed.
+    """
+    size = 0
+    digest = hashlib.sha1()
+    with open(input_path, 'wb') as out:
+        while block := file.stream.read(chunk):
+            out.write(block)
+            digest.update(block)
+            size += len(block)
+    return size, digest.hexdigest()
+
+
+# Re-submitting the same image with the same settings is common while
+# iterating in the UI; cache outputs keyed on content hash + settings
+CACHE_MAX_ENTRIES = 256
+_cache_lock = threading.Lock()
+
+
+def _link_or_copy(src, dst):
+    """Hard-link src to dst, copying when linking is unsupported."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _prune_conversion_cache():
+    """Drop the least-recently-used cache entries beyond the size bound."""
+    with _cache_lock:
+        entries = sorted(Path(OUTPUT_FOLDER).glob('cache-*'),
+                         key=lambda p: p.stat().st_mtime)
+        for path in entries[:-CACHE_MAX_ENTRIES]:
+            path.unlink(missing_ok=True)
+
+
+def _process_one(file, method, convert_func, settings, output_format,
+                 include_preview=True):
+    """Save one uploaded file, run the converter, and build its result dict."""
+    upload_name = Path(file.filename)
+    filename = upload_name.name
+
+    # Unique prefix so concurrent workers (and same-named uploads) never collide
+    unique = uuid.uuid4().hex[:8]
+    saved_name = f"{unique}_{filename}"
+    input_path = Path(UPLOAD_FOLDER) / saved_name
+
+    # Keep the original on disk and hand out a preview URL (before conversion)
+    original_preview = None
+    preview_token = None
+    input_size, content_hash = _save_upload(file, input_path)
+    if include_preview and input_size < 15000000:  # < 15MB for original preview
+        preview_token = _register_preview(saved_name)
+        original_preview = f'/preview_original/{preview_token}'
+
+    # Generate output filename with correct extension
+    output_filename = f"{unique}_{upload_name.stem}.{output_format}"
+    output_path = Path(OUTPUT_FOLDER) / output_filename
+
+    # Same bytes + same settings -> same output; serve conversions of
+    # identical re-submissions from the cache
+    settings_sig = hashlib.md5(repr(sorted(settings.items())).encode()).hexdigest()[:8]
+    cache_path = Path(OUTPUT_FOLDER) / f"cache-{content_hash}-{method}-{settings_sig}.{output_format}"
+
+    # The pruner can unlink an entry between the existence check and the
+    # link, so treat any OSError on the hit path as a miss and convert
+    cache_hit = False
+    if cache_path.exists():
+        try:
+            _link_or_copy(cache_path, output_path)
+            os.utime(cache_path)  # keep the LRU ordering honest
+            cache_hit = True
+        except OSError:
+            pass
+
+    if cache_hit:
+        success, message = True, "Success"
+    else:
         success, message = convert_func(input_path, output_path, **settings)
+        if success and output_path.exists():
+            _link_or_copy(output_path, cache_path)
+            _prune_conversion_cache()
+
+    result = {
+        'filename': filename,
+        'output_filename': output_filename,
+        'output_format': output_format,
+        'success': success,
+        'message': message
+    }
 
-        result = {
-            'filename': filename,
-            'output_filename': output_filename,
-            'output_format': output_format,
-            'success': success,
-            'message': message
-        }
+    # Include original image preview
+    if original_preview:
+        result['original_preview'] = original_preview
+
+    # Include preview/download URLs if successful
+    if success and output_path.exists():
+        result['download_url'] = f'/download/{output_filename}'
+        # Only SVG can be previewed in browser
+        if output_format == 'svg':
+            result['preview_url'] = f'/preview/{output_filename}'
+
+    # Clean up input file (previewed files are reaped after their TTL)
+    if preview_token is None:
+        input_path.unlink(missing_ok=True)
 
-        # Include original image preview
-        if original_preview:
-            result['original_preview'] = original_preview
+    return result
 
-        # Include preview/download URLs if successful
-        if success and os.path.exists(output_path):
-            result['download_url'] = f'/download/{output_filename}'
-            # Only SVG can be previewed in browser
-            if output_format == 'svg':
-                result['preview_url'] = f'/preview/{output_filename}'
 
-        results.append(result)
+@app.route('/preview_original/<token>')
+def preview_original(token):
+    """Serve an original uploaded image for preview."""
+    with _preview_lock:
+        entry = _preview_files.get(token)
+    if entry is None:
+        return json_response({'error': 'Preview not found or expired'}, 404)
+    filename = entry[0]
+    ext = Path(filename).suffix.lower()
+    mime_type = _IMG_MIME.get(ext, 'image/png')
+    return send_from_directory(UPLOAD_FOLDER, filename, mimetype=mime_type,
+                               conditional=True)
 
-        # Clean up input file
-        if os.path.exists(input_path):
-            os.remove(input_path)
 
-    return jsonify({'results': results})
+@app.route('/admin/refresh-deps', methods=['POST'])
+def refresh_deps():
+    """Re-probe external tools (e.g. after installing autotrace/vtracer)."""
+    refresh_dependencies()
+    return json_response({'available_methods': get_available_methods()})
 
 
 @app.route('/download/<filename>')
 def download(filename):
     """Download a converted file."""
-    return send_from_directory(OUTPUT_FOLDER, filename, as_attachment=True)
+    # Strip the internal uniqueness prefix so downloads keep the original name
+    download_name = filename
+    prefix, _, rest = filename.partition('_')
+    if rest and len(prefix) == 8 and all(c in '0123456789abcdef' for c in prefix):
+        download_name = rest
+    return send_from_directory(OUTPUT_FOLDER, filename, as_attachment=True,
+                               download_name=download_name, conditional=True)
 
 
 @app.route('/preview/<filename>')
 def preview(filename):
     """Preview a converted file in browser."""
     # Determine mimetype from extension
-    ext = os.path.splitext(filename)[1].lower()
-    mimetypes = {
-        '.svg': 'image/svg+xml',
-        '.pdf': 'application/pdf',
-        '.eps': 'application/postscript',
-        '.dxf': 'application/dxf'
-    }
-    mimetype = mimetypes.get(ext, 'application/octet-stream')
-    return send_from_directory(OUTPUT_FOLDER, filename, mimetype=mimetype)
+    ext = Path(filename).suffix.lower()
+    mimetype = _OUT_MIME.get(ext, 'application/octet-stream')
+    # conditional=True emits ETag/Last-Modified so UI refreshes get 304s
+    return send_from_directory(OUTPUT_FOLDER, filename, mimetype=mimetype,
+                               conditional=True)
 
 
 if __name__ == '__main__':
@@ -251,4 +416,12 @@ if __name__ == '__main__':
     # Use 0.0.0.0 to allow access from Docker host
     host = os.environ.get('FLASK_HOST', '127.0.0.1')
     debug = os.environ.get('FLASK_DEBUG', 'true').lower() == 'true'
-    app.run(host=host, debug=debug, port=5000)
+
+    if debug:
+        app.run(host=host, debug=True, port=5000)
+    else:
+        # Werkzeug's dev server serializes requests; waitress lets
+        # concurrent /convert calls overlap their subprocess waits
+        from waitress import serve
+        serve(app, host=host, port=5000,
+              threads=max(4, (os.cpu_count() or 1) * 2))
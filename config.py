@@ -6,11 +6,48 @@ Tool paths, folders, and environment settings
 import os
 import tempfile
 
+# Prefer GraphicsMagick (gm convert) over ImageMagick for the threshold
+# pipeline when it is installed - its lower startup cost wins for the
+# small per-file operations the tracers drive. Set to 'false' to force
+# ImageMagick even when gm is present.
+PREFER_GRAPHICSMAGICK = os.environ.get('PREFER_GRAPHICSMAGICK', 'true').lower() == 'true'
+
 # Tool paths - Use environment variables or fall back to defaults
 POTRACE_PATH = os.environ.get('POTRACE_PATH', '/usr/bin/potrace')
 AUTOTRACE_PATH = os.environ.get('AUTOTRACE_PATH', '/usr/bin/autotrace')
 VTRACER_PATH = os.environ.get('VTRACER_PATH', '/usr/local/bin/vtracer')
 
-# Temp folders for uploads and outputs
-UPLOAD_FOLDER = tempfile.mkdtemp(prefix="versor_")
+# Upload size cap in MB (shared with app.py, which enforces it per file)
+MAX_UPLOAD_MB = int(os.environ.get('VERSOR_MAX_UPLOAD_MB', '50'))
+
+
+def _tmpfs_dir():
+    """
+    Pick /dev/shm for uploads only when it can hold a real batch.
+
+    Uploads are retained for preview and batches save concurrently, so
+    tmpfs needs room for several maximum-size files; a container left
+    at the 64MB /dev/shm default would ENOSPC mid-upload, which is far
+    worse than the disk writeback the tmpfs placement avoids.
+    """
+    if not os.path.isdir('/dev/shm'):
+        return None
+    try:
+        stats = os.statvfs('/dev/shm')
+    except OSError:
+        return None
+    free_mb = stats.f_bavail * stats.f_frsize // (1024 * 1024)
+    if free_mb < 8 * MAX_UPLOAD_MB:
+        return None
+    return '/dev/shm'
+
+
+# Temp folders for uploads and outputs.
+# Uploads (and the intermediate BMP/PBM files written beside them) live on
+# tmpfs when it is big enough - they are read back immediately, so keeping
+# them in RAM skips disk writeback entirely; undersized or missing tmpfs
+# falls back to disk. Outputs stay on disk since SVGs persist for later
+# download.
+_SHM = _tmpfs_dir()
+UPLOAD_FOLDER = tempfile.mkdtemp(prefix="versor_", dir=_SHM)
 OUTPUT_FOLDER = tempfile.mkdtemp(prefix="versor_out_")
@@ -5,12 +5,13 @@ Converters package - vectorization methods
 from .potrace import convert_with_potrace
 from .centerline import convert_with_centerline
 from .vtracer import convert_with_vtracer
-from .dependencies import check_dependencies, get_available_methods
+from .dependencies import check_dependencies, get_available_methods, refresh_dependencies
 
 __all__ = [
     'convert_with_potrace',
     'convert_with_centerline',
     'convert_with_vtracer',
     'check_dependencies',
-    'get_available_methods'
+    'get_available_methods',
+    'refresh_dependencies'
 ]
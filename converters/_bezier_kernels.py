@@ -0,0 +1,82 @@
+"""
+Optional Numba-compiled kernels for bezier flattening.
+
+When numba is installed, sample_cubic/sample_quad point at @njit kernels
+that evaluate every sample of a curve run as native scalar arithmetic.
+Without numba both names are None and svg_to_dxf keeps its Bernstein
+matrix-product path - numba stays a purely optional dependency, same as
+in _rdp_kernels.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _sample_cubic_numba(a6, x0, y0, ts):
+        """Sample an absolute (n, 6) cubic run at parameters ts."""
+        n = a6.shape[0]
+        m = ts.shape[0]
+        out = np.empty((n * m, 2))
+        px, py = x0, y0
+        k = 0
+        for i in range(n):
+            x1 = a6[i, 0]
+            y1 = a6[i, 1]
+            x2 = a6[i, 2]
+            y2 = a6[i, 3]
+            x3 = a6[i, 4]
+            y3 = a6[i, 5]
+            for j in range(m):
+                t = ts[j]
+                mt = 1.0 - t
+                mt2 = mt * mt
+                t2 = t * t
+                w0 = mt2 * mt
+                w1 = 3.0 * mt2 * t
+                w2 = 3.0 * mt * t2
+                w3 = t2 * t
+                out[k, 0] = w0 * px + w1 * x1 + w2 * x2 + w3 * x3
+                out[k, 1] = w0 * py + w1 * y1 + w2 * y2 + w3 * y3
+                k += 1
+            px = x3
+            py = y3
+        return out
+
+    @njit(cache=True, fastmath=True)
+    def _sample_quad_numba(a4, x0, y0, ts):
+        """Sample an absolute (n, 4) quadratic run at parameters ts."""
+        n = a4.shape[0]
+        m = ts.shape[0]
+        out = np.empty((n * m, 2))
+        px, py = x0, y0
+        k = 0
+        for i in range(n):
+            x1 = a4[i, 0]
+            y1 = a4[i, 1]
+            x2 = a4[i, 2]
+            y2 = a4[i, 3]
+            for j in range(m):
+                t = ts[j]
+                mt = 1.0 - t
+                w0 = mt * mt
+                w1 = 2.0 * mt * t
+                w2 = t * t
+                out[k, 0] = w0 * px + w1 * x1 + w2 * x2
+                out[k, 1] = w0 * py + w1 * y1 + w2 * y2
+                k += 1
+            px = x2
+            py = y2
+        return out
+
+    sample_cubic = _sample_cubic_numba
+    sample_quad = _sample_quad_numba
+else:
+    sample_cubic = None
+    sample_quad = None
@@ -0,0 +1,86 @@
+"""
+Optional Numba-compiled kernel for RDP path simplification.
+
+When numba is installed, rdp_mask points at an @njit kernel that runs
+the whole Ramer-Douglas-Peucker scan as native code (the inner distance
+loop compiles to a few FMAs per point). Without numba, rdp_mask is None
+and simplify.py keeps its vectorized NumPy path - numba stays a purely
+optional dependency, like the external tracing tools.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _rdp_mask_numba(xs, ys, eps):
+        """Return a uint8 keep-mask for RDP over coordinate arrays."""
+        n = xs.shape[0]
+        mask = np.zeros(n, dtype=np.uint8)
+        mask[0] = 1
+        mask[n - 1] = 1
+
+        # Preallocated explicit stack of (lo, hi) spans
+        stack = np.empty((2 * n, 2), dtype=np.int64)
+        top = 0
+        stack[top, 0] = 0
+        stack[top, 1] = n - 1
+        top += 1
+
+        # Squared comparisons: dist > eps iff num^2 > eps^2 * len^2,
+        # so the hot loop carries no sqrt and no division
+        eps2 = eps * eps
+
+        while top > 0:
+            top -= 1
+            lo = stack[top, 0]
+            hi = stack[top, 1]
+            if hi - lo < 2:
+                continue
+
+            dx = xs[hi] - xs[lo]
+            dy = ys[hi] - ys[lo]
+            len2 = dx * dx + dy * dy
+
+            max_d2 = -1.0
+            max_i = lo
+            if len2 == 0.0:
+                # Degenerate span: distance from the shared endpoint
+                for i in range(lo + 1, hi):
+                    ddx = xs[i] - xs[lo]
+                    ddy = ys[i] - ys[lo]
+                    d2 = ddx * ddx + ddy * ddy
+                    if d2 > max_d2:
+                        max_d2 = d2
+                        max_i = i
+                split = max_d2 > eps2
+            else:
+                c = xs[hi] * ys[lo] - ys[hi] * xs[lo]
+                for i in range(lo + 1, hi):
+                    num = dy * xs[i] - dx * ys[i] + c
+                    d2 = num * num
+                    if d2 > max_d2:
+                        max_d2 = d2
+                        max_i = i
+                split = max_d2 > eps2 * len2
+
+            if split:
+                mask[max_i] = 1
+                stack[top, 0] = lo
+                stack[top, 1] = max_i
+                top += 1
+                stack[top, 0] = max_i
+                stack[top, 1] = hi
+                top += 1
+
+        return mask
+
+    rdp_mask = _rdp_mask_numba
+else:
+    rdp_mask = None
@@ -5,12 +5,19 @@ Best for: line art, text, engraving, technical drawings
 
 import os
 import subprocess
+import threading
+from pathlib import Path
 from config import AUTOTRACE_PATH
-from .dependencies import get_imagemagick_cmd
+from .dependencies import get_threshold_cmd
+from .magick_daemon import threshold_to_file
 
 # Autotrace supported output formats
 AUTOTRACE_FORMATS = ['svg', 'dxf', 'eps', 'pdf']
 
+# Autotrace has no stdin flag, but on POSIX it happily reads /dev/stdin,
+# which lets us pipe the PBM straight out of ImageMagick
+_STDIN_PATH = '/dev/stdin' if os.path.exists('/dev/stdin') else None
+
 
 def convert_with_centerline(input_path, output_path, despeckle_level=2,
                             corner_threshold=100, line_threshold=1.0,
@@ -34,46 +41,75 @@ def convert_with_centerline(input_path, output_path, despeckle_level=2,
     Returns:
         Tuple of (success: bool, message: str)
     """
-    # Create temp PBM path (autotrace prefers PBM/PGM)
-    pbm_path = input_path.rsplit('.', 1)[0] + '.pbm'
-
     # Validate format
     fmt = output_format.lower() if output_format in AUTOTRACE_FORMATS else 'svg'
 
-    try:
-        # Preprocess with ImageMagick (convert to PBM)
-        im_cmd = get_imagemagick_cmd()
-        if not im_cmd:
-            return False, "ImageMagick not found"
+    # Preprocess with ImageMagick/GraphicsMagick (convert to PBM)
+    threshold_cmd = get_threshold_cmd()
+    if not threshold_cmd:
+        return False, "ImageMagick not found"
 
-        magick_cmd = [im_cmd, input_path, "-threshold", f"{threshold}%"]
-        if invert:
-            magick_cmd.append("-negate")
-        magick_cmd.append(pbm_path)
+    magick_cmd = threshold_cmd + [input_path, "-threshold", f"{threshold}%"]
+    if invert:
+        magick_cmd.append("-negate")
 
-        result = subprocess.run(magick_cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            return False, f"ImageMagick error: {result.stderr}"
-
-        # Run autotrace with centerline flag
-        autotrace_cmd = [
-            AUTOTRACE_PATH,
-            "-centerline",
-            "-output-format", fmt,
-            "-despeckle-level", str(despeckle_level),
-            "-corner-threshold", str(corner_threshold),
-            "-line-threshold", str(line_threshold),
-            "-output-file", output_path,
-            pbm_path
-        ]
-
-        result = subprocess.run(autotrace_cmd, capture_output=True, text=True)
+    autotrace_args = [
+        AUTOTRACE_PATH,
+        "-centerline",
+        "-output-format", fmt,
+        "-despeckle-level", str(despeckle_level),
+        "-corner-threshold", str(corner_threshold),
+        "-line-threshold", str(line_threshold),
+        "-output-file", output_path,
+    ]
+
+    if _STDIN_PATH:
+        # Pipe the bitmap between the two tools - no intermediate file,
+        # no second pass through the filesystem
+        magick_proc = subprocess.Popen(magick_cmd + ['pbm:-'],
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+        autotrace_proc = subprocess.Popen(autotrace_args + [_STDIN_PATH],
+                                          stdin=magick_proc.stdout,
+                                          stdout=subprocess.DEVNULL,
+                                          stderr=subprocess.PIPE)
+        magick_proc.stdout.close()  # let autotrace see EOF when magick exits
+
+        # Drain magick's stderr on a side thread while autotrace runs: a
+        # chatty magick could otherwise fill the pipe buffer, block, and
+        # stall the chain waiting on an EOF that never comes
+        magick_err_parts = []
+        stderr_drain = threading.Thread(
+            target=lambda: magick_err_parts.append(magick_proc.stderr.read()))
+        stderr_drain.start()
+        _, autotrace_err = autotrace_proc.communicate()
+        stderr_drain.join()
+        magick_proc.stderr.close()
+        magick_proc.wait()
+        magick_err = magick_err_parts[0] if magick_err_parts else b''
+
+        if magick_proc.returncode != 0:
+            return False, f"ImageMagick error: {magick_err.decode('utf-8', 'replace')}"
+        if autotrace_proc.returncode != 0:
+            return False, f"Autotrace error: {autotrace_err.decode('utf-8', 'replace')}"
+
+        return True, "Success"
+
+    # Fallback (Windows): write the PBM to a temp file
+    # (reuses the persistent magick worker when available)
+    pbm_path = Path(input_path).with_suffix('.pbm')
+    try:
+        success, message = threshold_to_file(input_path, pbm_path, threshold, invert)
+        if not success:
+            return False, message
+
+        result = subprocess.run(autotrace_args + [pbm_path],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         if result.returncode != 0:
-            return False, f"Autotrace error: {result.stderr}"
+            return False, f"Autotrace error: {result.stderr.decode('utf-8', 'replace')}"
 
         return True, "Success"
 
     finally:
-        # Clean up temp PBM
-        if os.path.exists(pbm_path):
-            os.remove(pbm_path)
+        # Clean up temp PBM (missing_ok avoids the racy exists+remove pair)
+        pbm_path.unlink(missing_ok=True)
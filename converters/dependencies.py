@@ -2,16 +2,21 @@
 Dependency checking for all vectorization tools
 """
 
+import functools
 import os
 import subprocess
 import shutil
-from config import POTRACE_PATH, AUTOTRACE_PATH, VTRACER_PATH
+from config import POTRACE_PATH, AUTOTRACE_PATH, VTRACER_PATH, PREFER_GRAPHICSMAGICK
 
 
+@functools.lru_cache(maxsize=1)
 def get_imagemagick_cmd():
     """
     Get the ImageMagick command name.
     Returns 'magick' for v7+, 'convert' for v6, or None if not found.
+
+    Cached for process lifetime - every conversion calls this and the
+    PATH probe is a handful of stat syscalls that never change.
     """
     if shutil.which('magick'):
         return 'magick'
@@ -20,10 +25,43 @@ def get_imagemagick_cmd():
     return None
 
 
+@functools.lru_cache(maxsize=1)
+def get_graphicsmagick_cmd():
+    """
+    Get the GraphicsMagick command name.
+    Returns 'gm' if installed, or None. Cached like get_imagemagick_cmd().
+    """
+    if shutil.which('gm'):
+        return 'gm'
+    return None
+
+
+def get_threshold_cmd():
+    """
+    Command prefix for the threshold/convert step of the tracing pipelines.
+
+    Prefers GraphicsMagick when installed and PREFER_GRAPHICSMAGICK is
+    set; falls back to ImageMagick otherwise. Returns a list suitable
+    for prepending to arguments (['gm', 'convert'], ['magick'] or
+    ['convert']), or None when no tool is available.
+    """
+    if PREFER_GRAPHICSMAGICK:
+        gm_cmd = get_graphicsmagick_cmd()
+        if gm_cmd:
+            return [gm_cmd, 'convert']
+    im_cmd = get_imagemagick_cmd()
+    return [im_cmd] if im_cmd else None
+
+
+@functools.lru_cache(maxsize=1)
 def check_dependencies():
     """
     Verify all vectorization tools are available.
 
+    Cached after the first call - checking spawns an ImageMagick process,
+    which is far too expensive to repeat on every page load. Call
+    refresh_dependencies() to re-probe after installing a tool.
+
     Returns:
         Tuple of (errors: list, warnings: list)
         - errors: Critical issues that prevent basic functionality
@@ -59,10 +97,13 @@ def check_dependencies():
     return errors, warnings
 
 
+@functools.lru_cache(maxsize=1)
 def get_available_methods():
     """
     Check which conversion methods are available.
 
+    Cached after the first call; see check_dependencies().
+
     Returns:
         Dict of method name -> bool (available)
     """
@@ -71,3 +112,11 @@ def get_available_methods():
         'centerline': os.path.exists(AUTOTRACE_PATH),
         'vtracer': os.path.exists(VTRACER_PATH)
     }
+
+
+def refresh_dependencies():
+    """Drop cached probe results so tools installed mid-run are picked up."""
+    get_imagemagick_cmd.cache_clear()
+    get_graphicsmagick_cmd.cache_clear()
+    check_dependencies.cache_clear()
+    get_available_methods.cache_clear()
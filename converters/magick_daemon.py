@@ -0,0 +1,116 @@
+"""
+Long-lived ImageMagick worker for batch conversions.
+
+Every conversion needs a thresholded B/W bitmap, and spawning a fresh
+`magick` process per file costs tens of milliseconds of fork/exec and
+dynamic-linker work. `magick -script -` keeps a single process alive and
+executes operations fed through stdin, so batches pay the startup cost
+once. ImageMagick v6 (`convert`) has no script mode; callers fall back
+to one-shot runs there.
+"""
+
+import os
+import subprocess
+import threading
+
+from .dependencies import get_threshold_cmd
+
+# Printed by the script after each operation so we know it finished
+_SENTINEL = "versor-op-done"
+
+
+class MagickDaemon:
+    """A persistent `magick -script -` process guarded by a lock."""
+
+    def __init__(self):
+        self._proc = None
+        self._lock = threading.Lock()
+
+    def _ensure_process(self):
+        """Start (or restart) the script process; None if unsupported."""
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        # Script mode is ImageMagick v7 only; if the threshold pipeline
+        # prefers GraphicsMagick, one-shot gm runs beat an IM daemon
+        if get_threshold_cmd() != ['magick']:
+            return None
+        try:
+            self._proc = subprocess.Popen(
+                ['magick', '-script', '-'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
+            )
+        except OSError:
+            self._proc = None
+        return self._proc
+
+    def _close(self):
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+            except OSError:
+                pass
+            self._proc = None
+
+    def threshold(self, input_path, output_path, threshold, invert=False):
+        """
+        Write a thresholded B/W copy of input_path to output_path.
+
+        Returns True on confirmed success; False means the caller should
+        fall back to a one-shot process.
+        """
+        with self._lock:
+            proc = self._ensure_process()
+            if proc is None:
+                return False
+
+            negate = '-negate ' if invert else ''
+            script = (f'-read "{input_path}" -threshold {threshold}% '
+                      f'{negate}-write "{output_path}" -delete 0--1 '
+                      f'-print "{_SENTINEL}\\n"\n')
+            try:
+                proc.stdin.write(script)
+                proc.stdin.flush()
+                line = proc.stdout.readline()
+            except (BrokenPipeError, OSError):
+                self._close()
+                return False
+
+            if _SENTINEL not in line:
+                # Process died or errored mid-script; restart next call
+                self._close()
+                return False
+
+        return os.path.exists(output_path)
+
+
+_daemon = MagickDaemon()
+
+
+def threshold_to_file(input_path, output_path, threshold, invert=False):
+    """
+    Threshold an image to B/W and write it, reusing the daemon when possible.
+
+    Returns:
+        Tuple of (success: bool, message: str)
+    """
+    if _daemon.threshold(input_path, output_path, threshold, invert):
+        return True, "Success"
+
+    # One-shot fallback (GraphicsMagick, ImageMagick v6, daemon failure)
+    threshold_cmd = get_threshold_cmd()
+    if not threshold_cmd:
+        return False, "ImageMagick not found"
+
+    cmd = threshold_cmd + [str(input_path), "-threshold", f"{threshold}%"]
+    if invert:
+        cmd.append("-negate")
+    cmd.append(str(output_path))
+
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        return False, f"ImageMagick error: {result.stderr.decode('utf-8', 'replace')}"
+    return True, "Success"
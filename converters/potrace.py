@@ -3,10 +3,11 @@ Potrace converter - outline tracing
 Best for: solid shapes, silhouettes, CNC cutting
 """
 
-import os
 import subprocess
+import threading
+from pathlib import Path
 from config import POTRACE_PATH
-from .dependencies import get_imagemagick_cmd
+from .dependencies import get_threshold_cmd
 from .simplify import simplify_svg_file, straighten_svg_file
 from .svg_to_dxf import convert_svg_to_dxf
 
@@ -46,29 +47,19 @@ def convert_with_potrace(input_path, output_path, corner_threshold=0, optimize_t
     Returns:
         Tuple of (success: bool, message: str)
     """
-    # Create temp BMP path
-    bmp_path = input_path.rsplit('.', 1)[0] + '.bmp'
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+
+    threshold_cmd = get_threshold_cmd()
+    if not threshold_cmd:
+        return False, "ImageMagick not found"
+
     # For post-processing with non-SVG output, we need SVG intermediate
     needs_postprocess = simplify or straighten
     use_svg_intermediate = needs_postprocess and output_format != 'svg'
-    svg_intermediate_path = output_path.rsplit('.', 1)[0] + '_temp.svg' if use_svg_intermediate else None
+    svg_intermediate_path = output_path.with_name(output_path.stem + '_temp.svg') if use_svg_intermediate else None
 
     try:
-        # Build ImageMagick command for B/W conversion
-        im_cmd = get_imagemagick_cmd()
-        if not im_cmd:
-            return False, "ImageMagick not found"
-
-        magick_cmd = [im_cmd, input_path, "-threshold", f"{threshold}%"]
-        if invert:
-            magick_cmd.append("-negate")
-        magick_cmd.append(bmp_path)
-
-        # Convert to BMP
-        result = subprocess.run(magick_cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            return False, f"ImageMagick error: {result.stderr}"
-
         # Determine what format to generate first
         if use_svg_intermediate:
             # Generate SVG first for post-processing, then convert to target format
@@ -78,10 +69,14 @@ def convert_with_potrace(input_path, output_path, corner_threshold=0, optimize_t
             initial_output = output_path
             format_flag = POTRACE_FORMATS.get(output_format, '-s')
 
-        # Build Potrace command
+        magick_cmd = threshold_cmd + [input_path, "-threshold", f"{threshold}%"]
+        if invert:
+            magick_cmd.append("-negate")
+
+        # Build Potrace command reading the bitmap from stdin
         potrace_cmd = [
             POTRACE_PATH,
-            bmp_path,
+            "-",
             "-a", str(corner_threshold),
             "-O", str(optimize_tolerance),
             "-t", str(despeckle),
@@ -90,9 +85,34 @@ def convert_with_potrace(input_path, output_path, corner_threshold=0, optimize_t
         # Add format flag (split if it has multiple parts like '-b dxf')
         potrace_cmd[2:2] = format_flag.split()
 
-        result = subprocess.run(potrace_cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            return False, f"Potrace error: {result.stderr}"
+        # Pipe the thresholded bitmap straight into Potrace - no temp BMP
+        # on disk, and the two processes overlap instead of running serially
+        magick_proc = subprocess.Popen(magick_cmd + ['bmp:-'],
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+        potrace_proc = subprocess.Popen(potrace_cmd,
+                                        stdin=magick_proc.stdout,
+                                        stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.PIPE)
+        magick_proc.stdout.close()  # let potrace see EOF when magick exits
+
+        # Drain magick's stderr on a side thread while potrace runs: a
+        # chatty magick could otherwise fill the pipe buffer, block, and
+        # stall the chain waiting on an EOF that never comes
+        magick_err_parts = []
+        stderr_drain = threading.Thread(
+            target=lambda: magick_err_parts.append(magick_proc.stderr.read()))
+        stderr_drain.start()
+        _, potrace_err = potrace_proc.communicate()
+        stderr_drain.join()
+        magick_proc.stderr.close()
+        magick_proc.wait()
+        magick_err = magick_err_parts[0] if magick_err_parts else b''
+
+        if magick_proc.returncode != 0:
+            return False, f"ImageMagick error: {magick_err.decode('utf-8', 'replace')}"
+        if potrace_proc.returncode != 0:
+            return False, f"Potrace error: {potrace_err.decode('utf-8', 'replace')}"
 
         # Apply post-processing (works on SVG)
         svg_to_process = svg_intermediate_path if use_svg_intermediate else output_path
@@ -124,8 +144,6 @@ def convert_with_potrace(input_path, output_path, corner_threshold=0, optimize_t
         return True, "Success"
 
     finally:
-        # Clean up temp files
-        if os.path.exists(bmp_path):
-            os.remove(bmp_path)
-        if svg_intermediate_path and os.path.exists(svg_intermediate_path):
-            os.remove(svg_intermediate_path)
+        # Clean up temp files (missing_ok avoids the racy exists+remove pair)
+        if svg_intermediate_path:
+            svg_intermediate_path.unlink(missing_ok=True)
@@ -3,8 +3,111 @@ SVG path simplification using Ramer-Douglas-Peucker algorithm.
 Reduces node count while preserving shape geometry.
 """
 
+import os
 import re
 import math
+from io import StringIO
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
+import numpy as np
+
+from ._rdp_kernels import rdp_mask as _rdp_mask_jit
+
+# lxml is optional, like the external tracing tools: with it, file
+# rewriting goes through a real XML parser; without it, the original
+# regex rewrite still works
+try:
+    from lxml import etree as _etree
+except ImportError:
+    _etree = None
+
+# Matches <path ... d="..." ...> for the regex fallback
+_PATH_D_RE = re.compile(r'(<path[^>]*\sd=")([^"]+)("[^>]*>)', re.IGNORECASE)
+
+# Below this many paths the fork/spawn cost of a process pool outweighs
+# the parallel speedup, so the work stays in-process
+_POOL_MIN_PATHS = 32
+
+
+def _map_paths(func, ds):
+    """
+    Apply func to every d string, in parallel for path-heavy files.
+
+    Each path's rework is independent and CPU-bound in pure Python, so
+    large files (Potrace output can carry thousands of paths) fan out to
+    a process pool; small ones run serially. func must be picklable -
+    the file-level callers pass a partial over a module-level function.
+
+    Traced files often repeat identical subpaths (duplicated holes,
+    glyph reuse), so each distinct d is computed once and the results
+    fanned back out in document order.
+    """
+    unique = list(dict.fromkeys(ds))
+
+    results = None
+    if len(unique) > _POOL_MIN_PATHS:
+        try:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+                results = list(ex.map(func, unique, chunksize=16))
+        except OSError:
+            # No subprocess support (restricted environments) - run serial
+            pass
+    if results is None:
+        results = [func(d) for d in unique]
+
+    if len(unique) == len(ds):
+        return results
+    table = dict(zip(unique, results))
+    return [table[d] for d in ds]
+
+
+def _rewrite_svg_paths(input_path, output_path, transform_all):
+    """
+    Rewrite every <path d="..."> in an SVG file.
+
+    transform_all receives the list of d strings in document order and
+    returns the replacement list (taking a list rather than one string
+    lets callers batch or parallelize the per-path work). With lxml
+    installed the file goes through a real XML parse, which handles
+    multi-attribute and multi-line <path> elements the regex can trip
+    on; otherwise the regex rewrite is used.
+
+    Returns:
+        Tuple of (success: bool, message: str)
+    """
+    try:
+        if _etree is not None:
+            tree = _etree.parse(str(input_path))
+            elems = [e for e in tree.iter('{*}path') if e.get('d')]
+            new_ds = transform_all([e.get('d') for e in elems])
+            for elem, new_d in zip(elems, new_ds):
+                elem.set('d', new_d)
+            tree.write(str(output_path))
+            return True, "Success"
+
+        with open(input_path, 'r') as f:
+            svg_content = f.read()
+
+        matches = list(_PATH_D_RE.finditer(svg_content))
+        new_ds = transform_all([m.group(2) for m in matches])
+
+        # Splice replacements between the original d-attribute spans
+        parts = []
+        last = 0
+        for match, new_d in zip(matches, new_ds):
+            parts.append(svg_content[last:match.start(2)])
+            parts.append(new_d)
+            last = match.end(2)
+        parts.append(svg_content[last:])
+
+        with open(output_path, 'w') as f:
+            f.write("".join(parts))
+
+        return True, "Success"
+
+    except Exception as e:
+        return False, str(e)
 
 
 def perpendicular_distance(point, line_start, line_end):
@@ -25,6 +128,61 @@ def perpendicular_distance(point, line_start, line_end):
     return numerator / denominator
 
 
+def _rdp_keep_mask(xs, ys, epsilon):
+    """
+    Core of the Ramer-Douglas-Peucker algorithm on coordinate arrays.
+
+    Uses an explicit (lo, hi) stack instead of recursion and computes all
+    interior perpendicular distances for a span in one vectorized
+    expression, so the per-point work happens in NumPy's C loops.
+
+    Returns a uint8 keep-mask over the points; callers gather retained
+    points with one boolean index instead of assembling an index list.
+    """
+    if _rdp_mask_jit is not None:
+        return _rdp_mask_jit(np.ascontiguousarray(xs),
+                             np.ascontiguousarray(ys), float(epsilon))
+
+    n = len(xs)
+    mask = np.zeros(n, dtype=np.uint8)
+    mask[0] = 1
+    mask[n - 1] = 1
+    stack = [(0, n - 1)]
+    # Comparisons work on squared quantities: dist > eps is equivalent
+    # to num^2 > eps^2 * len^2, which needs no sqrt and no division
+    eps2 = epsilon * epsilon
+
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo < 2:
+            continue
+
+        dx = xs[hi] - xs[lo]
+        dy = ys[hi] - ys[lo]
+        len2 = dx * dx + dy * dy
+        if len2 == 0:
+            # Degenerate span (closed on itself): use distance from endpoint
+            ddx = xs[lo + 1:hi] - xs[lo]
+            ddy = ys[lo + 1:hi] - ys[lo]
+            dist2 = ddx * ddx + ddy * ddy
+            idx = int(dist2.argmax())
+            split = float(dist2[idx]) > eps2
+        else:
+            num = np.abs(dy * xs[lo + 1:hi] - dx * ys[lo + 1:hi]
+                         + xs[hi] * ys[lo] - ys[hi] * xs[lo])
+            idx = int(num.argmax())
+            max_num = float(num[idx])
+            split = max_num * max_num > eps2 * len2
+
+        if split:
+            mid = lo + 1 + idx
+            mask[mid] = 1
+            stack.append((lo, mid))
+            stack.append((mid, hi))
+
+    return mask
+
+
 def rdp_simplify(points, epsilon):
     """
     Ramer-Douglas-Peucker algorithm for path simplification.
@@ -39,25 +197,53 @@ def rdp_simplify(points, epsilon):
     if len(points) < 3:
         return points
 
-    # Find the point with the maximum distance from the line
-    max_dist = 0
-    max_idx = 0
-    for i in range(1, len(points) - 1):
-        dist = perpendicular_distance(points[i], points[0], points[-1])
-        if dist > max_dist:
-            max_dist = dist
-            max_idx = i
-
-    # If max distance is greater than epsilon, recursively simplify
-    if max_dist > epsilon:
-        # Recursive call
-        left = rdp_simplify(points[:max_idx + 1], epsilon)
-        right = rdp_simplify(points[max_idx:], epsilon)
-        # Concatenate results (avoiding duplicate point at max_idx)
-        return left[:-1] + right
+    pts = np.asarray(points, dtype=np.float64)
+    mask = _rdp_keep_mask(pts[:, 0], pts[:, 1], epsilon)
+    return [points[i] for i in np.nonzero(mask)[0]]
+
+
+# SVG path tokenization - compiled once at import, shared by the
+# simplify and straighten passes
+_CMD_RE = re.compile(r'([MmLlHhVvCcSsQqTtAaZz])')
+_NUM_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+# Inserts a separator before signs used as implicit delimiters ("1-2" / "1+2")
+_SIGN_SEP_RE = re.compile(r'(?<=[0-9.])([-+])')
+
+
+def _parse_args(args_str):
+    """
+    Parse a command's argument substring into a float64 array.
+
+    Numbers are converted in bulk by NumPy's C parser instead of one
+    Python-level float() per token; Potrace output contains millions of
+    coordinates, so this is the hot part of path parsing.
+    """
+    if not args_str or args_str.isspace():
+        return np.empty(0)
+
+    s = args_str.replace(',', ' ')
+    if 'e' in s or 'E' in s:
+        # Shield exponent signs from the separator insertion below
+        s = s.replace('e-', 'e\x00').replace('E-', 'E\x00')
+        s = _SIGN_SEP_RE.sub(r' \1', s)
+        s = s.replace('e\x00', 'e-').replace('E\x00', 'E-')
     else:
-        # All points between first and last can be removed
-        return [points[0], points[-1]]
+        s = _SIGN_SEP_RE.sub(r' \1', s)
+
+    try:
+        return np.array(s.split(), dtype=np.float64)
+    except ValueError:
+        # Malformed data: fall back to the tolerant regex scan
+        return np.array([float(x) for x in _NUM_RE.findall(args_str)])
+
+
+def _tokenize_path(d):
+    """Yield (command, args-array) pairs from SVG path data in a single pass."""
+    tokens = _CMD_RE.split(d)
+    n_tokens = len(tokens)
+    for i in range(1, n_tokens, 2):
+        args_str = tokens[i + 1] if i + 1 < n_tokens else ''
+        yield tokens[i], _parse_args(args_str)
 
 
 def parse_svg_path(d):
@@ -65,30 +251,20 @@ def parse_svg_path(d):
     Parse SVG path data into a list of commands and coordinates.
     Returns list of (command, points) tuples.
     """
-    # Regex to match path commands and their arguments
-    command_pattern = re.compile(r'([MmLlHhVvCcSsQqTtAaZz])')
-    number_pattern = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
-
-    commands = []
-    tokens = command_pattern.split(d)
-
-    i = 1  # Skip first empty string
-    while i < len(tokens):
-        cmd = tokens[i]
-        args_str = tokens[i + 1] if i + 1 < len(tokens) else ''
-        args = [float(x) for x in number_pattern.findall(args_str)]
-        commands.append((cmd, args))
-        i += 2
-
-    return commands
+    return list(_tokenize_path(d))
 
 
 def path_to_points(commands):
     """
-    Convert SVG path commands to a list of absolute points.
-    Also returns info about subpaths for reconstruction.
+    Convert SVG path commands to absolute coordinate arrays.
+
+    Returns (xs, ys, subpaths): two float64 arrays sharing an index
+    (structure-of-arrays - 16 bytes per point instead of a tuple object
+    per point) plus a list of (start_idx, end_idx, is_closed) spans for
+    reconstruction.
     """
-    points = []
+    xs = []
+    ys = []
     subpaths = []  # List of (start_idx, end_idx, is_closed)
     current_subpath_start = 0
 
@@ -98,82 +274,95 @@ def path_to_points(commands):
     for cmd, args in commands:
         if cmd == 'M':
             # Start new subpath
-            if points:
-                subpaths.append((current_subpath_start, len(points) - 1, False))
-            current_subpath_start = len(points)
+            if xs:
+                subpaths.append((current_subpath_start, len(xs) - 1, False))
+            current_subpath_start = len(xs)
             x, y = args[0], args[1]
             start_x, start_y = x, y
-            points.append((x, y))
+            xs.append(x)
+            ys.append(y)
             # Handle implicit lineto commands after M
             for i in range(2, len(args), 2):
                 x, y = args[i], args[i + 1]
-                points.append((x, y))
+                xs.append(x)
+                ys.append(y)
         elif cmd == 'm':
-            if points:
-                subpaths.append((current_subpath_start, len(points) - 1, False))
-            current_subpath_start = len(points)
+            if xs:
+                subpaths.append((current_subpath_start, len(xs) - 1, False))
+            current_subpath_start = len(xs)
             x += args[0]
             y += args[1]
             start_x, start_y = x, y
-            points.append((x, y))
+            xs.append(x)
+            ys.append(y)
             for i in range(2, len(args), 2):
                 x += args[i]
                 y += args[i + 1]
-                points.append((x, y))
+                xs.append(x)
+                ys.append(y)
         elif cmd == 'L':
             for i in range(0, len(args), 2):
                 x, y = args[i], args[i + 1]
-                points.append((x, y))
+                xs.append(x)
+                ys.append(y)
         elif cmd == 'l':
             for i in range(0, len(args), 2):
                 x += args[i]
                 y += args[i + 1]
-                points.append((x, y))
+                xs.append(x)
+                ys.append(y)
         elif cmd == 'H':
             for val in args:
                 x = val
-                points.append((x, y))
+                xs.append(x)
+                ys.append(y)
         elif cmd == 'h':
             for val in args:
                 x += val
-                points.append((x, y))
+                xs.append(x)
+                ys.append(y)
         elif cmd == 'V':
             for val in args:
                 y = val
-                points.append((x, y))
+                xs.append(x)
+                ys.append(y)
         elif cmd == 'v':
             for val in args:
                 y += val
-                points.append((x, y))
+                xs.append(x)
+                ys.append(y)
         elif cmd == 'C':
             # Cubic bezier - sample it for simplification
             for i in range(0, len(args), 6):
                 # Just use endpoint for simplification (we'll lose curve info)
                 x, y = args[i + 4], args[i + 5]
-                points.append((x, y))
+                xs.append(x)
+                ys.append(y)
         elif cmd == 'c':
             for i in range(0, len(args), 6):
                 x += args[i + 4]
                 y += args[i + 5]
-                points.append((x, y))
+                xs.append(x)
+                ys.append(y)
         elif cmd in ('Z', 'z'):
             # Close path
-            if points and (x != start_x or y != start_y):
-                points.append((start_x, start_y))
-            subpaths.append((current_subpath_start, len(points) - 1, True))
-            current_subpath_start = len(points)
+            if xs and (x != start_x or y != start_y):
+                xs.append(start_x)
+                ys.append(start_y)
+            subpaths.append((current_subpath_start, len(xs) - 1, True))
+            current_subpath_start = len(xs)
             x, y = start_x, start_y
 
     # Handle last subpath if not closed
-    if current_subpath_start < len(points):
-        subpaths.append((current_subpath_start, len(points) - 1, False))
+    if current_subpath_start < len(xs):
+        subpaths.append((current_subpath_start, len(xs) - 1, False))
 
-    return points, subpaths
+    return np.asarray(xs), np.asarray(ys), subpaths
 
 
-def points_to_path(points, subpaths):
-    """Convert simplified points back to SVG path data."""
-    if not points or not subpaths:
+def points_to_path(xs, ys, subpaths):
+    """Convert simplified coordinate arrays back to SVG path data."""
+    if len(xs) == 0 or not subpaths:
         return ""
 
     path_parts = []
@@ -182,23 +371,26 @@ def points_to_path(points, subpaths):
         if start_idx > end_idx:
             continue
 
-        subpath_points = points[start_idx:end_idx + 1]
-        if not subpath_points:
-            continue
-
-        # Start with moveto
-        x, y = subpath_points[0]
-        parts = [f"M{x:.2f} {y:.2f}"]
-
-        # Add lineto commands for remaining points
-        for px, py in subpath_points[1:]:
-            parts.append(f"L{px:.2f} {py:.2f}")
+        # Format the whole subpath with one C-level % pass instead of an
+        # f-string call per point
+        n = end_idx - start_idx + 1
+        interleaved = np.empty(2 * n)
+        interleaved[0::2] = xs[start_idx:end_idx + 1]
+        interleaved[1::2] = ys[start_idx:end_idx + 1]
+
+        # Potrace mostly emits integer pixel coordinates; dropping the
+        # ".00" saves three bytes per number and the slower float format
+        if not np.any(interleaved % 1):
+            template = "M%d %d" + " L%d %d" * (n - 1)
+        else:
+            template = "M%.2f %.2f" + " L%.2f %.2f" * (n - 1)
+        part = template % tuple(interleaved.tolist())
 
         # Close path if it was originally closed
         if is_closed:
-            parts.append("Z")
+            part += " Z"
 
-        path_parts.append(" ".join(parts))
+        path_parts.append(part)
 
     return " ".join(path_parts)
 
@@ -214,32 +406,52 @@ def simplify_svg_path(d, epsilon=1.0):
     Returns:
         Simplified SVG path data string
     """
+    # Cheap pre-scan: fewer than 3 on-path points means RDP has nothing
+    # to remove, so skip the parse/emit pipeline entirely. H/V take one
+    # number per point, so two-per-point only holds when they're absent.
+    # Gated on length so only genuinely short paths pay for the token
+    # count - six numbers with separators fit well within 64 characters,
+    # and anything longer goes straight to the real pipeline.
+    if len(d) <= 64:
+        n_nums = len(_NUM_RE.findall(d))
+        if n_nums < 4 or (n_nums < 6 and not any(c in d for c in 'HhVv')):
+            return d
+
     commands = parse_svg_path(d)
-    points, subpaths = path_to_points(commands)
+    xs, ys, subpaths = path_to_points(commands)
 
-    if len(points) < 3:
+    if len(xs) < 3:
         return d
 
-    # Simplify each subpath independently
-    simplified_points = []
+    # Simplify each subpath independently (slices below are array views)
+    kept_xs = []
+    kept_ys = []
     new_subpaths = []
+    pos = 0
 
     for start_idx, end_idx, is_closed in subpaths:
-        subpath_points = points[start_idx:end_idx + 1]
+        if start_idx > end_idx:
+            continue
 
-        if len(subpath_points) < 3:
-            # Can't simplify, keep as-is
-            new_start = len(simplified_points)
-            simplified_points.extend(subpath_points)
-            new_subpaths.append((new_start, len(simplified_points) - 1, is_closed))
-        else:
-            # Apply RDP simplification
-            simplified = rdp_simplify(subpath_points, epsilon)
-            new_start = len(simplified_points)
-            simplified_points.extend(simplified)
-            new_subpaths.append((new_start, len(simplified_points) - 1, is_closed))
+        sub_xs = xs[start_idx:end_idx + 1]
+        sub_ys = ys[start_idx:end_idx + 1]
+
+        if len(sub_xs) >= 3:
+            # Apply RDP simplification (one boolean gather per axis)
+            keep = _rdp_keep_mask(sub_xs, sub_ys, epsilon).view(np.bool_)
+            sub_xs = sub_xs[keep]
+            sub_ys = sub_ys[keep]
 
-    return points_to_path(simplified_points, new_subpaths)
+        kept_xs.append(sub_xs)
+        kept_ys.append(sub_ys)
+        new_subpaths.append((pos, pos + len(sub_xs) - 1, is_closed))
+        pos += len(sub_xs)
+
+    if not kept_xs:
+        return ""
+
+    return points_to_path(np.concatenate(kept_xs), np.concatenate(kept_ys),
+                          new_subpaths)
 
 
 def simplify_svg_file(input_path, output_path, epsilon=1.0):
@@ -254,29 +466,9 @@ def simplify_svg_file(input_path, output_path, epsilon=1.0):
     Returns:
         Tuple of (success: bool, message: str)
     """
-    try:
-        with open(input_path, 'r') as f:
-            svg_content = f.read()
-
-        # Find and simplify all path d attributes
-        path_pattern = re.compile(r'(<path[^>]*\sd=")([^"]+)("[^>]*>)', re.IGNORECASE)
-
-        def replace_path(match):
-            prefix = match.group(1)
-            d = match.group(2)
-            suffix = match.group(3)
-            simplified_d = simplify_svg_path(d, epsilon)
-            return prefix + simplified_d + suffix
-
-        simplified_svg = path_pattern.sub(replace_path, svg_content)
-
-        with open(output_path, 'w') as f:
-            f.write(simplified_svg)
-
-        return True, "Success"
-
-    except Exception as e:
-        return False, str(e)
+    return _rewrite_svg_paths(
+        input_path, output_path,
+        partial(_map_paths, partial(simplify_svg_path, epsilon=epsilon)))
 
 
 # =============================================================================
@@ -294,6 +486,107 @@ def bezier_control_deviation(p0, p1, p2, p3):
     return max(dist1, dist2)
 
 
+@lru_cache(maxsize=1 << 16)
+def _fmt(v):
+    """
+    Format a coordinate to two decimals, caching repeats.
+
+    Traced coordinates come off an integer pixel grid and repeat
+    heavily, so a dict hit replaces most format() calls in the scalar
+    emit paths.
+    """
+    return format(v, '.2f')
+
+
+@lru_cache(maxsize=1 << 16)
+def _fmt_int(v):
+    """Integer-valued coordinate formatter; see _fmt."""
+    return '%d' % v
+
+
+def _abs_cubic(a6, x, y, relative):
+    """
+    Resolve an (n, 6) run of cubic arguments to absolute coordinates.
+
+    Relative segments are anchored on their start points, recovered with
+    a cumulative sum over the endpoint offsets.
+    """
+    if not relative:
+        return a6
+    ends = np.cumsum(a6[:, 4:6], axis=0) + (x, y)
+    starts = np.vstack(([[x, y]], ends[:-1]))
+    return a6 + np.tile(starts, 3)
+
+
+def _abs_cubic_smooth(a4, x, y, last_control, relative):
+    """
+    Expand an (n, 4) run of smooth-cubic (S/s) arguments to absolute
+    (n, 6) cubics.
+
+    Each first control point is the reflection of the previous segment's
+    second control about the segment start; within the run those are
+    known up front (the preceding rows), so the whole expansion is
+    vectorized. With no previous control the first control collapses to
+    the start point, per the SVG spec.
+    """
+    if relative:
+        ends = np.cumsum(a4[:, 2:4], axis=0) + (x, y)
+        starts = np.vstack(([[x, y]], ends[:-1]))
+        p2 = a4[:, 0:2] + starts
+    else:
+        ends = a4[:, 2:4]
+        starts = np.vstack(([[x, y]], ends[:-1]))
+        p2 = a4[:, 0:2]
+
+    first_ctrl = last_control if last_control else (x, y)
+    prev_ctrl = np.vstack(([first_ctrl], p2[:-1]))
+    p1 = 2 * starts - prev_ctrl
+    return np.hstack((p1, p2, ends))
+
+
+def _emit_cubic_run(abs_a, x, y, tolerance, write):
+    """
+    Straighten a run of cubic segments in one vectorized pass.
+
+    abs_a is an (n, 6) array of absolute coordinates [x1 y1 x2 y2 x3 y3]
+    per segment, starting from current position (x, y). Control-point
+    deviations for the whole run are computed with NumPy instead of two
+    perpendicular_distance calls per segment; output goes through the
+    caller's write. Returns (x, y, last_control) after the run.
+    """
+    ends = abs_a[:, 4:6]
+    p0s = np.vstack(([[x, y]], ends[:-1]))
+    dx = ends[:, 0] - p0s[:, 0]
+    dy = ends[:, 1] - p0s[:, 1]
+    seg_len = np.hypot(dx, dy)
+    c = ends[:, 0] * p0s[:, 1] - ends[:, 1] * p0s[:, 0]
+    safe_len = np.where(seg_len > 0, seg_len, 1.0)
+
+    def _perp(px, py):
+        # Point-to-line distance; zero-length segments fall back to the
+        # distance from the shared endpoint (same as perpendicular_distance)
+        line_d = np.abs(dy * px - dx * py + c) / safe_len
+        point_d = np.hypot(px - p0s[:, 0], py - p0s[:, 1])
+        return np.where(seg_len > 0, line_d, point_d)
+
+    d1 = _perp(abs_a[:, 0], abs_a[:, 1])
+    d2 = _perp(abs_a[:, 2], abs_a[:, 3])
+    straight = (np.maximum(d1, d2) <= tolerance).tolist()
+
+    if not np.any(abs_a % 1):
+        line_t, curve_t = "L%d %d", "C%d %d %d %d %d %d"
+    else:
+        line_t, curve_t = "L%.2f %.2f", "C%.2f %.2f %.2f %.2f %.2f %.2f"
+
+    write(" ".join(
+        line_t % (seg[4], seg[5]) if is_straight
+        else curve_t % tuple(seg)
+        for seg, is_straight in zip(abs_a.tolist(), straight)))
+    write(" ")
+
+    return ends[-1, 0], ends[-1, 1], (abs_a[-1, 2], abs_a[-1, 3])
+
+
 def straighten_svg_path(d, tolerance=1.0):
     """
     Smart straightening: converts nearly-straight Bezier curves to lines
@@ -306,158 +599,101 @@ def straighten_svg_path(d, tolerance=1.0):
     Returns:
         Optimized SVG path data string with straight segments as lines
     """
-    command_pattern = re.compile(r'([MmLlHhVvCcSsQqTtAaZz])')
-    number_pattern = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
-
-    tokens = command_pattern.split(d)
-    result_parts = []
+    # One growable buffer instead of a list of small strings plus a
+    # final join; each emitted piece carries its own trailing separator
+    buf = StringIO()
+    write = buf.write
+    # Emit bare integers while every argument seen so far is integer-
+    # valued (positions stay on the grid only until a fractional arg
+    # appears, so the check below can only flip one way)
+    fmt = _fmt_int
+    ints_so_far = True
 
     x, y = 0, 0  # Current position
     start_x, start_y = 0, 0  # Subpath start
     last_control = None  # For smooth curve commands (S, s)
 
-    i = 1
-    while i < len(tokens):
-        cmd = tokens[i]
-        args_str = tokens[i + 1] if i + 1 < len(tokens) else ''
-        args = [float(n) for n in number_pattern.findall(args_str)]
-        i += 2
+    for cmd, args in _tokenize_path(d):
+        if ints_so_far and np.any(args % 1):
+            ints_so_far = False
+            fmt = _fmt
 
         if cmd == 'M':
             x, y = args[0], args[1]
             start_x, start_y = x, y
-            result_parts.append(f"M{x:.2f} {y:.2f}")
+            write(f"M{fmt(x)} {fmt(y)} ")
             # Implicit lineto after M
             for j in range(2, len(args), 2):
                 x, y = args[j], args[j + 1]
-                result_parts.append(f"L{x:.2f} {y:.2f}")
+                write(f"L{fmt(x)} {fmt(y)} ")
             last_control = None
 
         elif cmd == 'm':
             x += args[0]
             y += args[1]
             start_x, start_y = x, y
-            result_parts.append(f"M{x:.2f} {y:.2f}")
+            write(f"M{fmt(x)} {fmt(y)} ")
             for j in range(2, len(args), 2):
                 x += args[j]
                 y += args[j + 1]
-                result_parts.append(f"L{x:.2f} {y:.2f}")
+                write(f"L{fmt(x)} {fmt(y)} ")
             last_control = None
 
         elif cmd == 'L':
             for j in range(0, len(args), 2):
                 x, y = args[j], args[j + 1]
-                result_parts.append(f"L{x:.2f} {y:.2f}")
+                write(f"L{fmt(x)} {fmt(y)} ")
             last_control = None
 
         elif cmd == 'l':
             for j in range(0, len(args), 2):
                 x += args[j]
                 y += args[j + 1]
-                result_parts.append(f"L{x:.2f} {y:.2f}")
+                write(f"L{fmt(x)} {fmt(y)} ")
             last_control = None
 
         elif cmd == 'H':
             for val in args:
                 x = val
-                result_parts.append(f"L{x:.2f} {y:.2f}")
+                write(f"L{fmt(x)} {fmt(y)} ")
             last_control = None
 
         elif cmd == 'h':
             for val in args:
                 x += val
-                result_parts.append(f"L{x:.2f} {y:.2f}")
+                write(f"L{fmt(x)} {fmt(y)} ")
             last_control = None
 
         elif cmd == 'V':
             for val in args:
                 y = val
-                result_parts.append(f"L{x:.2f} {y:.2f}")
+                write(f"L{fmt(x)} {fmt(y)} ")
             last_control = None
 
         elif cmd == 'v':
             for val in args:
                 y += val
-                result_parts.append(f"L{x:.2f} {y:.2f}")
+                write(f"L{fmt(x)} {fmt(y)} ")
             last_control = None
 
-        elif cmd == 'C':
-            # Cubic Bezier - check if essentially straight
-            for j in range(0, len(args), 6):
-                p0 = (x, y)
-                p1 = (args[j], args[j + 1])
-                p2 = (args[j + 2], args[j + 3])
-                p3 = (args[j + 4], args[j + 5])
-
-                deviation = bezier_control_deviation(p0, p1, p2, p3)
-                if deviation <= tolerance:
-                    # Nearly straight - use line
-                    result_parts.append(f"L{p3[0]:.2f} {p3[1]:.2f}")
-                else:
-                    # Keep as curve
-                    result_parts.append(
-                        f"C{p1[0]:.2f} {p1[1]:.2f} {p2[0]:.2f} {p2[1]:.2f} {p3[0]:.2f} {p3[1]:.2f}"
-                    )
-                x, y = p3
-                last_control = p2
-
-        elif cmd == 'c':
-            for j in range(0, len(args), 6):
-                p0 = (x, y)
-                p1 = (x + args[j], y + args[j + 1])
-                p2 = (x + args[j + 2], y + args[j + 3])
-                p3 = (x + args[j + 4], y + args[j + 5])
-
-                deviation = bezier_control_deviation(p0, p1, p2, p3)
-                if deviation <= tolerance:
-                    result_parts.append(f"L{p3[0]:.2f} {p3[1]:.2f}")
-                else:
-                    result_parts.append(
-                        f"C{p1[0]:.2f} {p1[1]:.2f} {p2[0]:.2f} {p2[1]:.2f} {p3[0]:.2f} {p3[1]:.2f}"
-                    )
-                x, y = p3
-                last_control = p2
-
-        elif cmd == 'S':
-            # Smooth cubic - first control point is reflection of previous
-            for j in range(0, len(args), 4):
-                p0 = (x, y)
-                if last_control:
-                    p1 = (2 * x - last_control[0], 2 * y - last_control[1])
-                else:
-                    p1 = p0
-                p2 = (args[j], args[j + 1])
-                p3 = (args[j + 2], args[j + 3])
-
-                deviation = bezier_control_deviation(p0, p1, p2, p3)
-                if deviation <= tolerance:
-                    result_parts.append(f"L{p3[0]:.2f} {p3[1]:.2f}")
-                else:
-                    result_parts.append(
-                        f"C{p1[0]:.2f} {p1[1]:.2f} {p2[0]:.2f} {p2[1]:.2f} {p3[0]:.2f} {p3[1]:.2f}"
-                    )
-                x, y = p3
-                last_control = p2
-
-        elif cmd == 's':
-            for j in range(0, len(args), 4):
-                p0 = (x, y)
-                if last_control:
-                    p1 = (2 * x - last_control[0], 2 * y - last_control[1])
-                else:
-                    p1 = p0
-                p2 = (x + args[j], y + args[j + 1])
-                p3 = (x + args[j + 2], y + args[j + 3])
-
-                deviation = bezier_control_deviation(p0, p1, p2, p3)
-                if deviation <= tolerance:
-                    result_parts.append(f"L{p3[0]:.2f} {p3[1]:.2f}")
-                else:
-                    result_parts.append(
-                        f"C{p1[0]:.2f} {p1[1]:.2f} {p2[0]:.2f} {p2[1]:.2f} {p3[0]:.2f} {p3[1]:.2f}"
-                    )
-                x, y = p3
-                last_control = p2
+        elif cmd in ('C', 'c'):
+            # Cubic Bezier - straighten the whole run in one NumPy pass
+            # (a bare command with no arguments is a no-op)
+            if len(args) >= 6:
+                abs_a = _abs_cubic(np.asarray(args).reshape(-1, 6), x, y,
+                                   relative=(cmd == 'c'))
+                x, y, last_control = _emit_cubic_run(abs_a, x, y, tolerance,
+                                                     write)
+
+        elif cmd in ('S', 's'):
+            # Smooth cubic - expand reflected control points, then share
+            # the same straightening pass as C/c
+            if len(args) >= 4:
+                abs_a = _abs_cubic_smooth(np.asarray(args).reshape(-1, 4),
+                                          x, y, last_control,
+                                          relative=(cmd == 's'))
+                x, y, last_control = _emit_cubic_run(abs_a, x, y, tolerance,
+                                                     write)
 
         elif cmd == 'Q':
             # Quadratic Bezier - convert to check, keep as Q if curved
@@ -468,10 +704,10 @@ def straighten_svg_path(d, tolerance=1.0):
 
                 deviation = perpendicular_distance(p1, p0, p2)
                 if deviation <= tolerance:
-                    result_parts.append(f"L{p2[0]:.2f} {p2[1]:.2f}")
+                    write(f"L{fmt(p2[0])} {fmt(p2[1])} ")
                 else:
-                    result_parts.append(
-                        f"Q{p1[0]:.2f} {p1[1]:.2f} {p2[0]:.2f} {p2[1]:.2f}"
+                    write(
+                        f"Q{fmt(p1[0])} {fmt(p1[1])} {fmt(p2[0])} {fmt(p2[1])} "
                     )
                 x, y = p2
             last_control = None
@@ -484,16 +720,16 @@ def straighten_svg_path(d, tolerance=1.0):
 
                 deviation = perpendicular_distance(p1, p0, p2)
                 if deviation <= tolerance:
-                    result_parts.append(f"L{p2[0]:.2f} {p2[1]:.2f}")
+                    write(f"L{fmt(p2[0])} {fmt(p2[1])} ")
                 else:
-                    result_parts.append(
-                        f"Q{p1[0]:.2f} {p1[1]:.2f} {p2[0]:.2f} {p2[1]:.2f}"
+                    write(
+                        f"Q{fmt(p1[0])} {fmt(p1[1])} {fmt(p2[0])} {fmt(p2[1])} "
                     )
                 x, y = p2
             last_control = None
 
         elif cmd in ('Z', 'z'):
-            result_parts.append("Z")
+            write("Z ")
             x, y = start_x, start_y
             last_control = None
 
@@ -506,8 +742,8 @@ def straighten_svg_path(d, tolerance=1.0):
                     large_arc = int(args[j + 3])
                     sweep = int(args[j + 4])
                     ex, ey = args[j + 5], args[j + 6]
-                    result_parts.append(
-                        f"A{rx:.2f} {ry:.2f} {rotation:.2f} {large_arc} {sweep} {ex:.2f} {ey:.2f}"
+                    write(
+                        f"A{fmt(rx)} {fmt(ry)} {fmt(rotation)} {large_arc} {sweep} {fmt(ex)} {fmt(ey)} "
                     )
                     x, y = ex, ey
             else:
@@ -517,8 +753,8 @@ def straighten_svg_path(d, tolerance=1.0):
                     large_arc = int(args[j + 3])
                     sweep = int(args[j + 4])
                     ex, ey = x + args[j + 5], y + args[j + 6]
-                    result_parts.append(
-                        f"A{rx:.2f} {ry:.2f} {rotation:.2f} {large_arc} {sweep} {ex:.2f} {ey:.2f}"
+                    write(
+                        f"A{fmt(rx)} {fmt(ry)} {fmt(rotation)} {large_arc} {sweep} {fmt(ex)} {fmt(ey)} "
                     )
                     x, y = ex, ey
             last_control = None
@@ -527,17 +763,18 @@ def straighten_svg_path(d, tolerance=1.0):
             # Smooth quadratic - pass through (would need tracking)
             for j in range(0, len(args), 2):
                 x, y = args[j], args[j + 1]
-                result_parts.append(f"L{x:.2f} {y:.2f}")
+                write(f"L{fmt(x)} {fmt(y)} ")
             last_control = None
 
         elif cmd == 't':
             for j in range(0, len(args), 2):
                 x += args[j]
                 y += args[j + 1]
-                result_parts.append(f"L{x:.2f} {y:.2f}")
+                write(f"L{fmt(x)} {fmt(y)} ")
             last_control = None
 
-    return " ".join(result_parts)
+    out = buf.getvalue()
+    return out[:-1] if out else out
 
 
 def straighten_svg_file(input_path, output_path, tolerance=1.0):
@@ -553,25 +790,6 @@ def straighten_svg_file(input_path, output_path, tolerance=1.0):
     Returns:
         Tuple of (success: bool, message: str)
     """
-    try:
-        with open(input_path, 'r') as f:
-            svg_content = f.read()
-
-        path_pattern = re.compile(r'(<path[^>]*\sd=")([^"]+)("[^>]*>)', re.IGNORECASE)
-
-        def replace_path(match):
-            prefix = match.group(1)
-            d = match.group(2)
-            suffix = match.group(3)
-            straightened_d = straighten_svg_path(d, tolerance)
-            return prefix + straightened_d + suffix
-
-        optimized_svg = path_pattern.sub(replace_path, svg_content)
-
-        with open(output_path, 'w') as f:
-            f.write(optimized_svg)
-
-        return True, "Success"
-
-    except Exception as e:
-        return False, str(e)
+    return _rewrite_svg_paths(
+        input_path, output_path,
+        partial(_map_paths, partial(straighten_svg_path, tolerance=tolerance)))
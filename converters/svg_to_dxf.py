@@ -5,36 +5,333 @@ Converts SVG paths to DXF polylines, preserving the clean node structure.
 
 import re
 import math
+from functools import lru_cache, partial
+from itertools import chain
+
+import numpy as np
+
+from .simplify import _map_paths, _parse_args
+from ._bezier_kernels import (sample_cubic as _sample_cubic_jit,
+                              sample_quad as _sample_quad_jit)
+
+# lxml is optional, same as in simplify: with it, path extraction
+# streams through a real XML parser; without it, the regex scan works
+try:
+    from lxml import etree as _etree
+except ImportError:
+    _etree = None
+
+# Patterns compiled once at import; per-path and per-file calls reuse them
+_CMD_RE = re.compile(r'([MmLlHhVvCcSsQqTtAaZz])')
+_NUM_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_VIEWBOX_RE = re.compile(r'viewBox\s*=\s*"([^"]+)"')
+_WIDTH_RE = re.compile(r'width\s*=\s*"([\d.]+)')
+_HEIGHT_RE = re.compile(r'height\s*=\s*"([\d.]+)')
+_PATH_RE = re.compile(r'<path[^>]*\sd="([^"]+)"', re.IGNORECASE)
+
+# Default fixed sample count per bezier for the legacy flattening path
+_BEZIER_SAMPLES = 4
+# Sample count from which forward differencing beats the Bernstein
+# matrix product (three additions per sample vs a full row product);
+# at the default four samples the matrix path wins
+_FWD_DIFF_MIN_SAMPLES = 6
+
+
+@lru_cache(maxsize=8)
+def _uniform_grid(n):
+    """
+    Uniform sample parameters t = 1/n, ..., 1 with their Bernstein rows.
+
+    Sampling a whole run of curves is then one matrix product against
+    the control points; cached per grid size since only a couple of
+    densities are ever in play.
+    """
+    ts = np.arange(1, n + 1) / n
+    cubic_b = np.array([[(1 - t) ** 3, 3 * (1 - t) ** 2 * t,
+                         3 * (1 - t) * t ** 2, t ** 3] for t in ts])
+    quad_b = np.array([[(1 - t) ** 2, 2 * (1 - t) * t, t ** 2]
+                       for t in ts])
+    return ts, cubic_b, quad_b
+
+
+# DXF header, minimal tables, and start of the entities section, built
+# once at import; only the $EXTMAX extents vary per drawing. The footer
+# closes the entities section
+_DXF_PREAMBLE = "\n".join([
+    "0", "SECTION",
+    "2", "HEADER",
+    "9", "$ACADVER",
+    "1", "AC1015",  # AutoCAD 2000
+    "9", "$INSBASE",
+    "10", "0.0",
+    "20", "0.0",
+    "30", "0.0",
+    "9", "$EXTMIN",
+    "10", "0.0",
+    "20", "0.0",
+    "30", "0.0",
+    "9", "$EXTMAX",
+    "10", "%s",
+    "20", "%s",
+    "30", "0.0",
+    "0", "ENDSEC",
+    # Tables section (minimal)
+    "0", "SECTION",
+    "2", "TABLES",
+    "0", "TABLE",
+    "2", "LAYER",
+    "70", "1",
+    "0", "LAYER",
+    "2", "0",
+    "70", "0",
+    "62", "7",
+    "6", "CONTINUOUS",
+    "0", "ENDTAB",
+    "0", "ENDSEC",
+    # Entities section
+    "0", "SECTION",
+    "2", "ENTITIES",
+]) + "\n"
+_DXF_FOOTER = "0\nENDSEC\n0\nEOF"
+
+
+# Flattening tolerance (max control-point deviation from the chord, in
+# SVG units) below which a bezier segment collapses to its endpoint
+DEFAULT_CURVE_TOLERANCE = 0.25
+# Subdivision depth cap; 2^16 splits is far beyond any sane tolerance
+_MAX_SPLIT_DEPTH = 16
+
+
+def _abs_cubic_run(args, x, y, relative):
+    """
+    Shape a C/c argument list into an absolute (n, 6) array.
+
+    Relative runs resolve their start points with a cumulative sum;
+    incomplete trailing arguments are dropped.
+    """
+    a6 = np.asarray(args, dtype=np.float64)
+    a6 = a6[:a6.size // 6 * 6].reshape(-1, 6)
+    if relative:
+        ends = np.cumsum(a6[:, 4:6], axis=0) + (x, y)
+        a6 = a6 + np.tile(np.vstack(([[x, y]], ends[:-1])), 3)
+    return a6
+
+
+def _abs_quad_run(args, x, y, relative):
+    """Quadratic counterpart of _abs_cubic_run ((n, 4) array)."""
+    a4 = np.asarray(args, dtype=np.float64)
+    a4 = a4[:a4.size // 4 * 4].reshape(-1, 4)
+    if relative:
+        ends = np.cumsum(a4[:, 2:4], axis=0) + (x, y)
+        a4 = a4 + np.tile(np.vstack(([[x, y]], ends[:-1])), 2)
+    return a4
+
+
+def _split_cubic(p0, p1, p2, p3, tol2, out, depth):
+    """
+    De Casteljau subdivision of one curved cubic; appends to out.
+
+    Points are complex numbers (x + yj): each midpoint is then a single
+    C-level complex add and multiply instead of paired tuple indexing
+    and construction.
+    """
+    e1 = p1 - (2 * p0 + p3) / 3
+    e2 = p2 - (p0 + 2 * p3) / 3
+    if (depth >= _MAX_SPLIT_DEPTH
+            or max(e1.real * e1.real + e1.imag * e1.imag,
+                   e2.real * e2.real + e2.imag * e2.imag) <= tol2):
+        out.append((p3.real, p3.imag))
+        return
+
+    q0 = (p0 + p1) * 0.5
+    q1 = (p1 + p2) * 0.5
+    q2 = (p2 + p3) * 0.5
+    r0 = (q0 + q1) * 0.5
+    r1 = (q1 + q2) * 0.5
+    s = (r0 + r1) * 0.5
+    _split_cubic(p0, q0, r0, s, tol2, out, depth + 1)
+    _split_cubic(s, r1, q2, p3, tol2, out, depth + 1)
+
+
+def _split_quad(p0, p1, p2, tol2, out, depth):
+    """De Casteljau subdivision of one curved quadratic; appends to out."""
+    e = p1 - (p0 + p2) * 0.5
+    if (depth >= _MAX_SPLIT_DEPTH
+            or e.real * e.real + e.imag * e.imag <= tol2):
+        out.append((p2.real, p2.imag))
+        return
+
+    q0 = (p0 + p1) * 0.5
+    q1 = (p1 + p2) * 0.5
+    s = (q0 + q1) * 0.5
+    _split_quad(p0, q0, s, tol2, out, depth + 1)
+    _split_quad(s, q1, p2, tol2, out, depth + 1)
+
+
+def _flatten_cubic_run(a6, x, y, tolerance, out):
+    """
+    Adaptively flatten an absolute (n, 6) cubic run into out.
+
+    One vectorized flatness test covers the whole run: segments whose
+    control points sit within tolerance of the chord emit only their
+    endpoint (the common case for traced output), and only genuinely
+    curved segments pay for recursive subdivision. Returns (x, y).
+    """
+    starts = np.vstack(([[x, y]], a6[:-1, 4:6]))
+    e1 = a6[:, 0:2] - (2 * starts + a6[:, 4:6]) / 3
+    e2 = a6[:, 2:4] - (starts + 2 * a6[:, 4:6]) / 3
+    tol2 = tolerance * tolerance
+    flat = (np.maximum((e1 * e1).sum(axis=1),
+                       (e2 * e2).sum(axis=1)) <= tol2).tolist()
+
+    px, py = x, y
+    for row, is_flat in zip(a6.tolist(), flat):
+        if is_flat:
+            out.append((row[4], row[5]))
+        else:
+            _split_cubic(complex(px, py), complex(row[0], row[1]),
+                         complex(row[2], row[3]), complex(row[4], row[5]),
+                         tol2, out, 0)
+        px, py = row[4], row[5]
+    return px, py
+
+
+def _flatten_quad_run(a4, x, y, tolerance, out):
+    """Quadratic counterpart of _flatten_cubic_run. Returns (x, y)."""
+    starts = np.vstack(([[x, y]], a4[:-1, 2:4]))
+    e = a4[:, 0:2] - (starts + a4[:, 2:4]) * 0.5
+    tol2 = tolerance * tolerance
+    flat = ((e * e).sum(axis=1) <= tol2).tolist()
+
+    px, py = x, y
+    for row, is_flat in zip(a4.tolist(), flat):
+        if is_flat:
+            out.append((row[2], row[3]))
+        else:
+            _split_quad(complex(px, py), complex(row[0], row[1]),
+                        complex(row[2], row[3]), tol2, out, 0)
+        px, py = row[2], row[3]
+    return px, py
+
+
+def _forward_diff_cubic(p0, p1, p2, p3, n):
+    """
+    Sample a cubic at t = 1/n, 2/n, ..., 1 by forward differencing.
+
+    After the monomial setup every sample costs three additions (done
+    on complex points, as in _split_cubic) instead of a polynomial
+    evaluation - the cheaper route once the uniform sample count grows
+    past a handful. Returns an (n, 2) float64 array.
+    """
+    (ax, ay), (bx, by), (cx, cy), (dx, dy) = cubic_bezier_coeffs(
+        p0, p1, p2, p3)
+    a = complex(ax, ay)
+    b = complex(bx, by)
+    c = complex(cx, cy)
+
+    h = 1.0 / n
+    h2 = h * h
+    h3 = h2 * h
+    f = complex(dx, dy)
+    d1 = a * h3 + b * h2 + c * h
+    d2 = 6 * a * h3 + 2 * b * h2
+    d3 = 6 * a * h3
+
+    out = np.empty((n, 2))
+    for i in range(n):
+        f += d1
+        d1 += d2
+        d2 += d3
+        out[i, 0] = f.real
+        out[i, 1] = f.imag
+    return out
+
+
+def _sample_cubic_run(a6, x, y, n_samples=_BEZIER_SAMPLES):
+    """
+    Sample an absolute (n, 6) cubic run at n_samples uniform parameters
+    in one pass. Returns sample rows ((n*n_samples, 2)).
+    """
+    ts, cubic_b, _ = _uniform_grid(n_samples)
+    if _sample_cubic_jit is not None:
+        samples = _sample_cubic_jit(np.ascontiguousarray(a6), float(x),
+                                    float(y), ts)
+    elif n_samples >= _FWD_DIFF_MIN_SAMPLES:
+        runs = []
+        px, py = x, y
+        for row in a6.tolist():
+            runs.append(_forward_diff_cubic(
+                (px, py), (row[0], row[1]), (row[2], row[3]),
+                (row[4], row[5]), n_samples))
+            px, py = row[4], row[5]
+        samples = np.concatenate(runs)
+    else:
+        starts = np.vstack(([[x, y]], a6[:-1, 4:6]))
+        ctrl = np.concatenate((starts[:, None, :], a6.reshape(-1, 3, 2)),
+                              axis=1)
+        samples = (cubic_b @ ctrl).reshape(-1, 2)
+    return samples
+
+
+def _sample_quad_run(a4, x, y, n_samples=_BEZIER_SAMPLES):
+    """Quadratic counterpart of _sample_cubic_run ((n*n_samples, 2))."""
+    ts, _, quad_b = _uniform_grid(n_samples)
+    if _sample_quad_jit is not None:
+        samples = _sample_quad_jit(np.ascontiguousarray(a4), float(x),
+                                   float(y), ts)
+    else:
+        starts = np.vstack(([[x, y]], a4[:-1, 2:4]))
+        ctrl = np.concatenate((starts[:, None, :], a4.reshape(-1, 2, 2)),
+                              axis=1)
+        samples = (quad_b @ ctrl).reshape(-1, 2)
+    return samples
 
 
 def parse_svg_path(d):
-    """Parse SVG path data into commands."""
-    command_pattern = re.compile(r'([MmLlHhVvCcSsQqTtAaZz])')
-    number_pattern = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+    """
+    Parse SVG path data into (command, args) pairs.
 
-    tokens = command_pattern.split(d)
+    Argument substrings go through simplify's bulk parser, which hands
+    the whole token run to NumPy's C float converter in a single pass
+    instead of regex-scanning and float()-ing one token at a time (a
+    tolerant regex fallback kicks in on malformed data).
+    """
+    tokens = _CMD_RE.split(d)
+    n_tokens = len(tokens)
     commands = []
+    append = commands.append
+    parse_args = _parse_args
 
-    i = 1
-    while i < len(tokens):
-        cmd = tokens[i]
-        args_str = tokens[i + 1] if i + 1 < len(tokens) else ''
-        args = [float(x) for x in number_pattern.findall(args_str)]
-        commands.append((cmd, args))
-        i += 2
+    for i in range(1, n_tokens, 2):
+        args_str = tokens[i + 1] if i + 1 < n_tokens else ''
+        append((tokens[i], parse_args(args_str)))
 
     return commands
 
 
-def svg_path_to_polylines(d):
+def svg_path_to_polylines(d, curve_tolerance=DEFAULT_CURVE_TOLERANCE,
+                          bezier_samples=_BEZIER_SAMPLES):
     """
     Convert SVG path data to a list of polylines.
-    Each polyline is a list of (x, y) tuples.
+    Each polyline is an (n, 2) float64 array of (x, y) vertices.
     Returns list of (points, is_closed) tuples.
+
+    Beziers are flattened adaptively: segments gain vertices only where
+    curvature exceeds curve_tolerance, so sharp curves stay smooth and
+    nearly-straight ones stop wasting DXF vertices. Pass
+    curve_tolerance=None for the legacy fixed-grid flattening with
+    bezier_samples uniform samples per curve (dense grids route through
+    forward differencing).
     """
     commands = parse_svg_path(d)
     polylines = []
+    # One vertex buffer reused across subpaths; np.asarray snapshots it
+    # at each flush, so clearing in place avoids a list allocation (and
+    # its growth reallocations) per M/m/Z - and the bound methods below
+    # stay valid for the whole parse, hoisted out of the hot loop
     current_points = []
+    append = current_points.append
+    extend = current_points.extend
 
     x, y = 0, 0
     start_x, start_y = 0, 0
@@ -42,186 +339,275 @@ def svg_path_to_polylines(d):
     for cmd, args in commands:
         if cmd == 'M':
             if current_points:
-                polylines.append((current_points, False))
-            current_points = []
+                polylines.append(
+                    (np.asarray(current_points, dtype=np.float64), False))
+                del current_points[:]
             x, y = args[0], args[1]
             start_x, start_y = x, y
-            current_points.append((x, y))
-            # Implicit lineto after M
-            for i in range(2, len(args), 2):
-                x, y = args[i], args[i + 1]
-                current_points.append((x, y))
+            append((x, y))
+            # Implicit lineto after M - one bulk reshape per run, one
+            # extend per command instead of an append per vertex
+            if len(args) >= 4:
+                pts = args[2:2 + (len(args) - 2) // 2 * 2].reshape(-1, 2)
+                extend(map(tuple, pts.tolist()))
+                x, y = pts[-1]
 
         elif cmd == 'm':
             if current_points:
-                polylines.append((current_points, False))
-            current_points = []
+                polylines.append(
+                    (np.asarray(current_points, dtype=np.float64), False))
+                del current_points[:]
             x += args[0]
             y += args[1]
             start_x, start_y = x, y
-            current_points.append((x, y))
-            for i in range(2, len(args), 2):
-                x += args[i]
-                y += args[i + 1]
-                current_points.append((x, y))
+            append((x, y))
+            if len(args) >= 4:
+                pts = np.cumsum(
+                    args[2:2 + (len(args) - 2) // 2 * 2].reshape(-1, 2),
+                    axis=0) + (x, y)
+                extend(map(tuple, pts.tolist()))
+                x, y = pts[-1]
 
         elif cmd == 'L':
-            for i in range(0, len(args), 2):
-                x, y = args[i], args[i + 1]
-                current_points.append((x, y))
+            if len(args) >= 2:
+                pts = args[:len(args) // 2 * 2].reshape(-1, 2)
+                extend(map(tuple, pts.tolist()))
+                x, y = pts[-1]
 
         elif cmd == 'l':
-            for i in range(0, len(args), 2):
-                x += args[i]
-                y += args[i + 1]
-                current_points.append((x, y))
+            if len(args) >= 2:
+                pts = np.cumsum(args[:len(args) // 2 * 2].reshape(-1, 2),
+                                axis=0) + (x, y)
+                extend(map(tuple, pts.tolist()))
+                x, y = pts[-1]
 
         elif cmd == 'H':
-            for val in args:
-                x = val
-                current_points.append((x, y))
+            if len(args):
+                xs = args
+                extend(zip(xs.tolist(), [y] * len(xs)))
+                x = xs[-1]
 
         elif cmd == 'h':
-            for val in args:
-                x += val
-                current_points.append((x, y))
+            if len(args):
+                xs = x + np.cumsum(args)
+                extend(zip(xs.tolist(), [y] * len(xs)))
+                x = xs[-1]
 
         elif cmd == 'V':
-            for val in args:
-                y = val
-                current_points.append((x, y))
+            if len(args):
+                ys = args
+                extend(zip([x] * len(ys), ys.tolist()))
+                y = ys[-1]
 
         elif cmd == 'v':
-            for val in args:
-                y += val
-                current_points.append((x, y))
-
-        elif cmd == 'C':
-            # Cubic bezier - sample at intervals for DXF
-            for i in range(0, len(args), 6):
-                p0 = (x, y)
-                p1 = (args[i], args[i + 1])
-                p2 = (args[i + 2], args[i + 3])
-                p3 = (args[i + 4], args[i + 5])
-                # Sample the bezier curve
-                for t in [0.25, 0.5, 0.75, 1.0]:
-                    px, py = cubic_bezier_point(p0, p1, p2, p3, t)
-                    current_points.append((px, py))
-                x, y = p3
-
-        elif cmd == 'c':
-            for i in range(0, len(args), 6):
-                p0 = (x, y)
-                p1 = (x + args[i], y + args[i + 1])
-                p2 = (x + args[i + 2], y + args[i + 3])
-                p3 = (x + args[i + 4], y + args[i + 5])
-                for t in [0.25, 0.5, 0.75, 1.0]:
-                    px, py = cubic_bezier_point(p0, p1, p2, p3, t)
-                    current_points.append((px, py))
-                x, y = p3
-
-        elif cmd == 'Q':
+            if len(args):
+                ys = y + np.cumsum(args)
+                extend(zip([x] * len(ys), ys.tolist()))
+                y = ys[-1]
+
+        elif cmd in ('C', 'c'):
+            # Cubic bezier - flatness-tested across the run in one pass
+            if len(args) >= 6:
+                a6 = _abs_cubic_run(args, x, y, cmd == 'c')
+                if curve_tolerance is None:
+                    extend(map(tuple, _sample_cubic_run(
+                        a6, x, y, bezier_samples).tolist()))
+                    x, y = a6[-1, 4], a6[-1, 5]
+                else:
+                    x, y = _flatten_cubic_run(a6, x, y, curve_tolerance,
+                                              current_points)
+
+        elif cmd in ('Q', 'q'):
             # Quadratic bezier
-            for i in range(0, len(args), 4):
-                p0 = (x, y)
-                p1 = (args[i], args[i + 1])
-                p2 = (args[i + 2], args[i + 3])
-                for t in [0.25, 0.5, 0.75, 1.0]:
-                    px, py = quad_bezier_point(p0, p1, p2, t)
-                    current_points.append((px, py))
-                x, y = p2
-
-        elif cmd == 'q':
-            for i in range(0, len(args), 4):
-                p0 = (x, y)
-                p1 = (x + args[i], y + args[i + 1])
-                p2 = (x + args[i + 2], y + args[i + 3])
-                for t in [0.25, 0.5, 0.75, 1.0]:
-                    px, py = quad_bezier_point(p0, p1, p2, t)
-                    current_points.append((px, py))
-                x, y = p2
+            if len(args) >= 4:
+                a4 = _abs_quad_run(args, x, y, cmd == 'q')
+                if curve_tolerance is None:
+                    extend(map(tuple, _sample_quad_run(
+                        a4, x, y, bezier_samples).tolist()))
+                    x, y = a4[-1, 2], a4[-1, 3]
+                else:
+                    x, y = _flatten_quad_run(a4, x, y, curve_tolerance,
+                                             current_points)
 
         elif cmd in ('Z', 'z'):
-            # Close path
-            if current_points and (x != start_x or y != start_y):
+            # Close path; many exporters emit Z right after returning to
+            # the start, so a squared-distance check (with a tolerance
+            # absorbing float noise) skips the redundant closing vertex
+            dx = x - start_x
+            dy = y - start_y
+            if current_points and dx * dx + dy * dy > 1e-12:
                 current_points.append((start_x, start_y))
             if current_points:
-                polylines.append((current_points, True))
-            current_points = []
+                polylines.append(
+                    (np.asarray(current_points, dtype=np.float64), True))
+                del current_points[:]
             x, y = start_x, start_y
 
     # Handle unclosed path
     if current_points:
-        polylines.append((current_points, False))
+        polylines.append(
+            (np.asarray(current_points, dtype=np.float64), False))
 
     return polylines
 
 
 def cubic_bezier_point(p0, p1, p2, p3, t):
     """Calculate point on cubic bezier at parameter t."""
+    # Plain multiplications; ** would dispatch through float.__pow__
     mt = 1 - t
-    x = mt**3 * p0[0] + 3 * mt**2 * t * p1[0] + 3 * mt * t**2 * p2[0] + t**3 * p3[0]
-    y = mt**3 * p0[1] + 3 * mt**2 * t * p1[1] + 3 * mt * t**2 * p2[1] + t**3 * p3[1]
+    mt2 = mt * mt
+    t2 = t * t
+    w0 = mt2 * mt
+    w1 = 3 * mt2 * t
+    w2 = 3 * mt * t2
+    w3 = t2 * t
+    x = w0 * p0[0] + w1 * p1[0] + w2 * p2[0] + w3 * p3[0]
+    y = w0 * p0[1] + w1 * p1[1] + w2 * p2[1] + w3 * p3[1]
     return (x, y)
 
 
+def cubic_bezier_coeffs(p0, p1, p2, p3):
+    """
+    Monomial coefficients of a cubic bezier, per axis.
+
+    Returns ((ax, ay), (bx, by), (cx, cy), (dx, dy)) such that the point
+    at t is ((a*t + b)*t + c)*t + d - Horner form, three multiplies per
+    axis for callers that evaluate one segment at many parameters.
+    """
+    cx = 3 * (p1[0] - p0[0])
+    cy = 3 * (p1[1] - p0[1])
+    bx = 3 * (p2[0] - p1[0]) - cx
+    by = 3 * (p2[1] - p1[1]) - cy
+    ax = p3[0] - p0[0] - cx - bx
+    ay = p3[1] - p0[1] - cy - by
+    return (ax, ay), (bx, by), (cx, cy), (p0[0], p0[1])
+
+
 def quad_bezier_point(p0, p1, p2, t):
     """Calculate point on quadratic bezier at parameter t."""
     mt = 1 - t
-    x = mt**2 * p0[0] + 2 * mt * t * p1[0] + t**2 * p2[0]
-    y = mt**2 * p0[1] + 2 * mt * t * p1[1] + t**2 * p2[1]
+    w0 = mt * mt
+    w1 = 2 * mt * t
+    w2 = t * t
+    x = w0 * p0[0] + w1 * p1[0] + w2 * p2[0]
+    y = w0 * p0[1] + w1 * p1[1] + w2 * p2[1]
     return (x, y)
 
 
+def _svg_dimensions_from_attrib(attrib):
+    """Dimensions from a root <svg> attribute mapping (lxml branch)."""
+    viewbox = attrib.get('viewBox')
+    if viewbox:
+        parts = viewbox.split()
+        if len(parts) >= 4:
+            return float(parts[2]), float(parts[3])
+
+    width = attrib.get('width')
+    height = attrib.get('height')
+    if width and height:
+        width_match = re.match(r'[\d.]+', width)
+        height_match = re.match(r'[\d.]+', height)
+        if width_match and height_match:
+            return float(width_match.group()), float(height_match.group())
+
+    return 100, 100  # Default
+
+
+def _extract_svg_streaming(input_path):
+    """
+    Single-pass dimension and path extraction via lxml iterparse.
+
+    The file streams through libxml2's C tokenizer once instead of two
+    regex scans of the full text; completed elements are cleared as the
+    parse moves on, so memory stays bounded on path-heavy files, and
+    multi-line or reordered attributes that trip the regex parse fine.
+
+    Returns (width, height, d_strings).
+    """
+    width = height = None
+    ds = []
+    for event, elem in _etree.iterparse(str(input_path),
+                                        events=('start', 'end')):
+        if event == 'start':
+            # First start event is the root <svg>
+            if width is None:
+                width, height = _svg_dimensions_from_attrib(elem.attrib)
+            continue
+        if elem.tag.rpartition('}')[2] == 'path':
+            d = elem.get('d')
+            if d:
+                ds.append(d)
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+    if width is None:
+        width, height = 100, 100
+    return width, height, ds
+
+
 def extract_svg_dimensions(svg_content):
     """Extract viewBox or width/height from SVG."""
     # Try viewBox first
-    viewbox_match = re.search(r'viewBox\s*=\s*"([^"]+)"', svg_content)
+    viewbox_match = _VIEWBOX_RE.search(svg_content)
     if viewbox_match:
         parts = viewbox_match.group(1).split()
         if len(parts) >= 4:
             return float(parts[2]), float(parts[3])
 
     # Fall back to width/height
-    width_match = re.search(r'width\s*=\s*"([\d.]+)', svg_content)
-    height_match = re.search(r'height\s*=\s*"([\d.]+)', svg_content)
+    width_match = _WIDTH_RE.search(svg_content)
+    height_match = _HEIGHT_RE.search(svg_content)
     if width_match and height_match:
         return float(width_match.group(1)), float(height_match.group(1))
 
     return 100, 100  # Default
 
 
-def convert_svg_to_dxf(input_path, output_path):
+def convert_svg_to_dxf(input_path, output_path,
+                       curve_tolerance=DEFAULT_CURVE_TOLERANCE):
     """
     Convert an SVG file to DXF format.
 
     Args:
         input_path: Path to input SVG file
         output_path: Path for output DXF file
+        curve_tolerance: Max flattening deviation in SVG units
+            (None = fixed four-sample flattening)
 
     Returns:
         Tuple of (success: bool, message: str)
     """
     try:
-        with open(input_path, 'r') as f:
-            svg_content = f.read()
-
-        width, height = extract_svg_dimensions(svg_content)
-
-        # Extract all path d attributes
-        path_pattern = re.compile(r'<path[^>]*\sd="([^"]+)"', re.IGNORECASE)
-        paths = path_pattern.findall(svg_content)
-
-        all_polylines = []
-        for path_d in paths:
-            polylines = svg_path_to_polylines(path_d)
-            all_polylines.extend(polylines)
-
-        # Generate DXF content
-        dxf_content = generate_dxf(all_polylines, width, height)
-
+        if _etree is not None:
+            width, height, paths = _extract_svg_streaming(input_path)
+        else:
+            with open(input_path, 'r') as f:
+                svg_content = f.read()
+
+            width, height = extract_svg_dimensions(svg_content)
+
+            # Extract all path d attributes
+            paths = _PATH_RE.findall(svg_content)
+
+        # Too short to describe even a single segment ("M0 0" is four
+        # characters) - drop before paying for parse and flattening
+        paths = [path_d for path_d in paths if len(path_d) >= 4]
+
+        # Flattening is independent per path; _map_paths fans path-heavy
+        # files out to a process pool (and computes repeated d strings
+        # only once), same as the simplify/straighten passes. The chain
+        # stays lazy: generate_dxf consumes each polyline as it writes,
+        # so no flattened all-polylines list is ever materialized
+        polyline_iter = chain.from_iterable(_map_paths(
+            partial(svg_path_to_polylines, curve_tolerance=curve_tolerance),
+            paths))
+
+        # Stream DXF content straight to the output file
         with open(output_path, 'w') as f:
-            f.write(dxf_content)
+            generate_dxf(f, polyline_iter, width, height)
 
         return True, "Success"
 
@@ -229,77 +615,39 @@ def convert_svg_to_dxf(input_path, output_path):
         return False, str(e)
 
 
-def generate_dxf(polylines, width, height):
-    """Generate DXF file content from polylines."""
-    lines = []
-
-    # DXF Header
-    lines.extend([
-        "0", "SECTION",
-        "2", "HEADER",
-        "9", "$ACADVER",
-        "1", "AC1015",  # AutoCAD 2000
-        "9", "$INSBASE",
-        "10", "0.0",
-        "20", "0.0",
-        "30", "0.0",
-        "9", "$EXTMIN",
-        "10", "0.0",
-        "20", "0.0",
-        "30", "0.0",
-        "9", "$EXTMAX",
-        "10", str(width),
-        "20", str(height),
-        "30", "0.0",
-        "0", "ENDSEC",
-    ])
-
-    # Tables section (minimal)
-    lines.extend([
-        "0", "SECTION",
-        "2", "TABLES",
-        "0", "TABLE",
-        "2", "LAYER",
-        "70", "1",
-        "0", "LAYER",
-        "2", "0",
-        "70", "0",
-        "62", "7",
-        "6", "CONTINUOUS",
-        "0", "ENDTAB",
-        "0", "ENDSEC",
-    ])
+def generate_dxf(fh, polylines, width, height):
+    """
+    Stream DXF content for polylines into an open text file handle.
 
-    # Entities section
-    lines.extend([
-        "0", "SECTION",
-        "2", "ENTITIES",
-    ])
+    polylines may be any iterable of (points, is_closed) pairs; it is
+    consumed exactly once. Writing section-by-section keeps peak memory
+    at one polyline's worth of text instead of materializing the whole
+    drawing (two list entries per group code) and joining it at the end.
+    """
+    # Constant preamble built at import; only the extents are filled in
+    fh.write(_DXF_PREAMBLE % (width, height))
 
-    # Add polylines
+    # One write per polyline
     for points, is_closed in polylines:
-        if len(points) < 2:
+        pts = np.asarray(points, dtype=np.float64)
+        n = pts.shape[0]
+        if n < 2:
+            continue
+        # A polyline whose every vertex coincides draws nothing; skip it
+        # (straight lines are kept - they are real cut/engrave geometry)
+        if (pts == pts[0]).all():
             continue
 
-        # Flip Y coordinates (SVG has Y down, DXF has Y up)
-        flipped_points = [(x, height - y) for x, y in points]
-
-        lines.extend([
-            "0", "LWPOLYLINE",
-            "8", "0",  # Layer
-            "90", str(len(flipped_points)),  # Number of vertices
-            "70", "1" if is_closed else "0",  # Closed flag
-        ])
-
-        for x, y in flipped_points:
-            lines.extend([
-                "10", f"{x:.6f}",
-                "20", f"{y:.6f}",
-            ])
+        head = "0\nLWPOLYLINE\n8\n0\n90\n%d\n70\n%d\n" % (
+            n, 1 if is_closed else 0)
 
-    lines.extend([
-        "0", "ENDSEC",
-        "0", "EOF",
-    ])
+        # Flip Y coordinates (SVG has Y down, DXF has Y up) and
+        # interleave x/y as strided array stores, then format the whole
+        # vertex block with one C-level % pass instead of a float
+        # format call per coordinate
+        flat = np.empty(2 * n)
+        flat[0::2] = pts[:, 0]
+        flat[1::2] = height - pts[:, 1]
+        fh.write(head + ("10\n%.6f\n20\n%.6f\n" * n) % tuple(flat.tolist()))
 
-    return "\n".join(lines)
+    fh.write(_DXF_FOOTER)
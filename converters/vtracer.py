@@ -6,6 +6,18 @@ Best for: detailed artwork, illustrations, pixel art, color images
 import subprocess
 from config import VTRACER_PATH
 
+# vtracer parameters are small integers (app.py int()-converts every
+# form field), so argv strings come from one shared table instead of a
+# str() allocation per parameter per call
+_INT_STR = tuple(str(i) for i in range(256))
+
+
+def _arg_str(value):
+    """Stringify one vtracer parameter, via the table when it applies."""
+    if isinstance(value, int) and 0 <= value < 256:
+        return _INT_STR[value]
+    return str(value)
+
 
 def convert_with_vtracer(input_path, output_path, mode="spline",
                          color_precision=6, gradient_step=8,
@@ -39,17 +51,20 @@ def convert_with_vtracer(input_path, output_path, mode="spline",
             "--output", output_path,
             "--mode", mode,
             "--colormode", "color",
-            "--color_precision", str(color_precision),
-            "--gradient_step", str(gradient_step),
-            "--corner_threshold", str(corner_threshold),
-            "--segment_length", str(segment_length),
-            "--splice_threshold", str(splice_threshold),
-            "--filter_speckle", str(filter_speckle)
+            "--color_precision", _arg_str(color_precision),
+            "--gradient_step", _arg_str(gradient_step),
+            "--corner_threshold", _arg_str(corner_threshold),
+            "--segment_length", _arg_str(segment_length),
+            "--splice_threshold", _arg_str(splice_threshold),
+            "--filter_speckle", _arg_str(filter_speckle)
         ]
 
-        result = subprocess.run(vtracer_cmd, capture_output=True, text=True)
+        # Discard stdout and decode stderr only on failure - no point
+        # paying a UTF-8 pass on output nobody reads
+        result = subprocess.run(vtracer_cmd, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE)
         if result.returncode != 0:
-            return False, f"vtracer error: {result.stderr}"
+            return False, f"vtracer error: {result.stderr.decode('utf-8', 'replace')}"
 
         return True, "Success"
 
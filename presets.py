@@ -1,10 +1,59 @@
 """
 Presets for all vectorization methods
 Each method has its own optimized presets
+
+Presets are read on every conversion and never change at runtime, so
+each one is a frozen slots dataclass (attribute access through a
+descriptor, no per-dict hash table) and the tables are wrapped in
+MappingProxyType with interned keys - immutable, and lookups against
+request strings compare by identity first.
 """
 
+import sys
+from dataclasses import dataclass
+from types import MappingProxyType
+
+
+@dataclass(frozen=True, slots=True)
+class _PotracePreset:
+    name: str
+    description: str
+    corner_threshold: float
+    optimize_tolerance: float
+    despeckle: int
+    threshold: int
+
+
+@dataclass(frozen=True, slots=True)
+class _CenterlinePreset:
+    name: str
+    description: str
+    despeckle_level: int
+    corner_threshold: int
+    line_threshold: float
+    threshold: int
+
+
+@dataclass(frozen=True, slots=True)
+class _VtracerPreset:
+    name: str
+    description: str
+    mode: str
+    color_precision: int
+    gradient_step: int
+    corner_threshold: int
+    segment_length: int
+    splice_threshold: int
+    filter_speckle: int
+
+
+def _freeze(cls, raw):
+    """Intern the keys and wrap the table in a read-only mapping."""
+    return MappingProxyType({sys.intern(k): cls(**v) for k, v in raw.items()})
+
+
 # Potrace presets - outline tracing for CNC cutting
-POTRACE_PRESETS = {
+POTRACE_PRESETS = _freeze(_PotracePreset, {
     "cnc_precise": {
         "name": "CNC Precise",
         "description": "Maximum accuracy for tool paths. Sharp corners, tight curves.",
@@ -53,10 +102,10 @@ POTRACE_PRESETS = {
         "despeckle": 2,
         "threshold": 50
     }
-}
+})
 
 # Centerline presets - single-line tracing for engraving
-CENTERLINE_PRESETS = {
+CENTERLINE_PRESETS = _freeze(_CenterlinePreset, {
     "line_art": {
         "name": "Line Art",
         "description": "Clean single lines for sketches and drawings.",
@@ -97,10 +146,10 @@ CENTERLINE_PRESETS = {
         "line_threshold": 1.0,
         "threshold": 50
     }
-}
+})
 
 # vtracer presets - color/detail tracing
-VTRACER_PRESETS = {
+VTRACER_PRESETS = _freeze(_VtracerPreset, {
     "detailed": {
         "name": "Detailed",
         "description": "Maximum detail preservation for complex artwork.",
@@ -156,4 +205,4 @@ VTRACER_PRESETS = {
         "splice_threshold": 45,
         "filter_speckle": 4
     }
-}
+})
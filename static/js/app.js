@@ -386,6 +386,8 @@ function initConvertButton() {
         formData.append('method', currentMethod);
         formData.append('preset', currentPresets[currentMethod]);
         formData.append('output_format', currentFormat);
+        // The UI renders original previews; scripted callers may send 0 to skip them
+        formData.append('include_preview', '1');
 
         // Add method-specific custom parameters
         if (currentPresets[currentMethod] === 'custom') {